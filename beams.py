@@ -4,7 +4,7 @@ from OCC.Core.BRepBuilderAPI import BRepBuilderAPI_MakePolygon, BRepBuilderAPI_M
 from OCC.Core.BRepPrimAPI import BRepPrimAPI_MakeBox, BRepPrimAPI_MakePrism
 from OCC.Core.AIS import AIS_Shape, AIS_TextLabel
 from OCC.Core.Quantity import Quantity_Color, Quantity_TOC_RGB
-from map_builder import create_column_points
+from map_builder import create_column_points, skip_mask
 
 def drop_list_at_indexes(list, indexes):
     new_list = []
@@ -17,82 +17,52 @@ def drop_list_at_indexes(list, indexes):
             
 
 def beam_points(intersection_matrix, offset):
-    rows, cols, _ = intersection_matrix.shape
-    result = np.empty((rows, cols), dtype=object)
-    
-    o1 = offset/2
-    
-    for i in range(rows):
-        for j in range(cols):
-            p = intersection_matrix[i, j]
-            column_points = np.array([
-                [[p[0]-o1, p[1]-o1, 0],
-                [p[0], p[1]-o1, 0],
-                [p[0] + o1, p[1]-o1, 0]],
-                [[p[0] - o1, p[1], 0],
-                [p[0], p[1], 0],
-                [p[0] + o1, p[1], 0]],
-                [[p[0] - o1, p[1] + o1, 0],
-                [p[0], p[1] + o1, 0],
-                [p[0] + o1, p[1] + o1, 0]]
-            ])
-            result[i, j] = column_points
-    
-    return result
-
-
-def create_beam_pairs(beam_points, skipx, skipy):
-    rows, cols = beam_points.shape
-    x_beams = []
-    y_beams = []
+    """
+    Punctele de colț ale secțiunii fiecărui stâlp, pentru toate nodurile deodată.
+
+    Returns:
+        np.ndarray: (rows, cols, 3, 3, 3), vezi create_column_points.
+    """
+    return create_column_points(intersection_matrix, None, offset)
+
+
+def create_beam_pairs(beam_points, skipx, skipy=None, column_skip=None):
+    """
+    Perechile (start, end) de puncte pentru grinzile pe X și pe Y.
+
+    skipx: (i, j) elimină grinda dintre nodurile (i, j) și (i, j+1).
+    skipy: (i, j) marchează nodul (i+1, j) fără stâlp (forma tabelelor vechi).
+    column_skip: Mască (rows, cols) a nodurilor fără stâlp (True = lipsă).
+
+    Pe Y, fiecare grindă unește un nod cu stâlp de următorul nod cu stâlp din
+    aceeași coloană, trecând peste oricâte noduri lipsă; nodurile lipsă de la
+    capetele coloanei nu primesc grindă.
+
+    Returns:
+        tuple: (x_pairs, y_pairs), fiecare de formă (n, 2, 3, 3). Grinzile pe X
+        sunt în ordinea rândurilor, cele pe Y în ordinea coloanelor.
+    """
+    rows, cols = beam_points.shape[:2]
 
     # Generare perechi pe axa X
-    for i in range(rows):
-        for j in range(cols - 1):
-            if (i, j) in skipx:
-                if j ==0 and j < (cols - 2):  
-                    x_beam = (
-                        beam_points[i, j+1][[0, 1, 2], 2],  # [0,2], [1,2], [2,2] din stâlpul i
-                        beam_points[i, j+2][[0, 1, 2], 0]  # [0,0], [1,0], [2,0] din stâlpul i+1
-                    )
-
-                elif j == (cols -1):
-                    continue
-            else:
-                    x_beam = (
-                beam_points[i, j][[0, 1, 2], 2],  # [0,2], [1,2], [2,2] din stâlpul i
-                beam_points[i, j+1][[0, 1, 2], 0]  # [0,0], [1,0], [2,0] din stâlpul i+1
-            )
-            x_beams.append(x_beam)
-
-    # Generare perechi pe axa Y
-    for j in range(cols):
-        for i in range(rows - 1):
-
-            if (i, j) in skipy:
-                if i ==0 and i < (rows - 2):  
-                    y_beam = (
-                        beam_points[i+1, j][2, [0, 1, 2]],  # [2,0], [2,1], [2,2] din stâlpul j
-                        beam_points[i+2, j][0, [0, 1, 2]]  # [0,0], [0,1], [0,2] din stâlpul j+1
-                    )
-                elif i == (rows-1):
-                    continue
-                
-                else:
-                    y_beam = (
-                        beam_points[i, j][2, [0, 1, 2]],  # [2,0], [2,1], [2,2] din stâlpul j
-                        beam_points[i+2, j][0, [0, 1, 2]]  # [0,0], [0,1], [0,2] din stâlpul j+1
-                    )
-                    i = i+2
-            else:
-                 
-                y_beam = (
-                    beam_points[i, j][2, [0, 1, 2]],  # [2,0], [2,1], [2,2] din stâlpul j
-                    beam_points[i+1, j][0, [0, 1, 2]]  # [0,0], [0,1], [0,2] din stâlpul j+1
-                )
-            
-        
-            y_beams.append(y_beam)
+    xi, xj = np.nonzero(~skip_mask((rows, cols - 1), skipx))
+    x_beams = np.stack([
+        beam_points[xi, xj][:, :, 2],       # [0,2], [1,2], [2,2] din stâlpul (i, j)
+        beam_points[xi, xj + 1][:, :, 0],   # [0,0], [1,0], [2,0] din stâlpul (i, j+1)
+    ], axis=1)
+
+    # Generare perechi pe axa Y: între nodurile cu stâlp consecutive ale fiecărei coloane
+    missing = skip_mask((rows, cols), column_skip).copy()
+    marked = np.argwhere(skip_mask((rows - 1, cols), skipy))
+    missing[marked[:, 0] + 1, marked[:, 1]] = True
+    present = np.argwhere(~missing.T)   # (j, i), în ordinea coloanelor
+    same_column = present[:-1, 0] == present[1:, 0]
+    yj, yi = present[:-1][same_column].T
+    end = present[1:][same_column, 1]
+    y_beams = np.stack([
+        beam_points[yi, yj][:, 2, :],               # [2,0], [2,1], [2,2] din stâlpul (i, j)
+        beam_points[end, yj][:, 0, :],              # [0,0], [0,1], [0,2] din următorul stâlp
+    ], axis=1)
 
     return x_beams, y_beams
 
@@ -113,26 +83,33 @@ def print_beam_structure(x_beams, y_beams):
         print()
 
 
+def beam_skips(column_skip):
+    """
+    Săriturile grinzilor pe X deduse dintr-o mască de stâlpi lipsă (True = fără stâlp):
+    dispar tronsoanele care ating un nod fără stâlp. Pe Y masca se dă direct
+    lui create_beam_pairs (column_skip), care trece grinda peste nodurile lipsă.
+
+    Returns:
+        np.ndarray: skipx, array (n, 2) de indici pentru create_beam_pairs.
+    """
+    rows, cols = column_skip.shape
+    nodes = np.argwhere(column_skip)
+    left = nodes[nodes[:, 1] > 0] - [0, 1]
+    right = nodes[nodes[:, 1] < cols - 1]
+    return np.unique(np.concatenate([left, right]).reshape(-1, 2), axis=0)
+
+
 def create_beam_contours(beam_pairs):
-    beam_contours = []
-    
-    for beam in beam_pairs:
-        start_points, end_points = beam
-        
-        # Creăm conturul în ordine inversă acelor de ceasornic
-        contour = [
-            start_points[2],  # Punctul din dreapta jos al primului stâlp
-            start_points[1],  # Punctul din mijloc jos al primului stâlp
-            start_points[0],  # Punctul din stânga jos al primului stâlp
-            end_points[0],    # Punctul din stânga sus al celui de-al doilea stâlp
-            end_points[1],    # Punctul din mijloc sus al celui de-al doilea stâlp
-            end_points[2],    # Punctul din dreapta sus al celui de-al doilea stâlp
-            start_points[2]   # Înapoi la punctul de start pentru a închide conturul
-        ]
-        
-        beam_contours.append(np.array(contour))
-    
-    return beam_contours
+    """
+    Contururile închise ale grinzilor, în ordine inversă acelor de ceasornic.
+
+    Returns:
+        np.ndarray: (n_beams, 7, 3): start[2], start[1], start[0], end[0],
+        end[1], end[2] și din nou start[2] pentru a închide conturul.
+    """
+    pairs = np.asarray(beam_pairs, dtype=float).reshape(-1, 2, 3, 3)
+    start_points, end_points = pairs[:, 0], pairs[:, 1]
+    return np.concatenate([start_points[:, ::-1], end_points, start_points[:, 2:]], axis=1)
 
 # Funcție pentru a vizualiza contururile rezultate
 def print_beam_contours(beam_contours):
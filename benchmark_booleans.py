@@ -0,0 +1,75 @@
+import argparse
+import json
+import time
+
+from booleans import cut_many, cut, settings_for
+from building_engine import prism
+from geometry_utils import create_column
+
+# Compară tăierea în lanț (un BRepAlgoAPI_Cut per unealtă) cu o singură
+# operație cu listă de unelte, pe o rețea sintetică n x n de camere și stâlpi.
+# Toate variantele folosesc aceleași BooleanSettings, deci diferența vine doar
+# din numărul de operații.
+
+
+def grid_tools(n, span=4.0, height=2.8):
+    axes = [i * span for i in range(n)]
+    background = prism([[-0.125, -0.125], [axes[-1] + 0.125, -0.125],
+                        [axes[-1] + 0.125, axes[-1] + 0.125], [-0.125, axes[-1] + 0.125]], height)
+    tools = []
+    for i in range(n - 1):
+        for j in range(n - 1):
+            x0, x1 = axes[j] + 0.125, axes[j + 1] - 0.125
+            y0, y1 = axes[i] + 0.125, axes[i + 1] - 0.125
+            tools.append(prism([[x0, y0], [x1, y0], [x1, y1], [x0, y1]], height))
+    for y in axes:
+        for x in axes:
+            tools.append(create_column((x, y)))
+    return background, tools
+
+
+def chained_cut(shape, tools, settings=None):
+    for tool in tools:
+        shape = cut(shape, tool, site='benchmark', settings=settings)
+    return shape
+
+
+def run(sizes, repeat=1, settings=None):
+    """settings (BooleanSettings): Aplicate tuturor variantelor; implicit setările implicite din booleans."""
+    settings = settings or settings_for('benchmark')
+    rows = []
+    for n in sizes:
+        background, tools = grid_tools(n)
+        timings = {}
+        for name, func in [('chained', lambda s, t: chained_cut(s, t, settings)),
+                           ('single', lambda s, t: cut_many(s, t, order=False, site='benchmark', settings=settings)),
+                           ('single_ordered', lambda s, t: cut_many(s, t, site='benchmark', settings=settings))]:
+            best = None
+            for _ in range(repeat):
+                start = time.perf_counter()
+                func(background, tools)
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            timings[name] = best
+        rows.append({
+            'grid': f"{n}x{n}",
+            'tools': len(tools),
+            'settings': vars(settings),
+            **{f"{name}_seconds": value for name, value in timings.items()},
+            'speedup': timings['chained'] / timings['single_ordered'],
+        })
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark tăiere în lanț vs. o singură operație booleană.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[4, 8, 12, 16])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    for row in run(args.sizes, args.repeat):
+        print(json.dumps(row))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,199 @@
+import argparse
+import itertools
+import json
+import sys
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+import numpy as np
+
+from beams import beam_points, create_beam_pairs, create_beam_contours, beam_skips
+from booleans import BOOLEAN_TIMINGS, reset_boolean_timings
+from building_engine import build_building, window_placement, build_window
+from geometry_utils import VOLUME_CACHE
+from map_builder import skip_mask, column_list, create_column_points
+from profiling import StageTimer
+from shape_cache import SHAPE_CACHE
+
+# Benchmark fără afișare pentru etapele generării: map_builder, beams,
+# ferestre și clădirea completă, pe rețele sintetice n x n. Fiecare rând
+# JSON conține timpul, vârful de memorie Python (tracemalloc, măsurat într-o
+# trecere separată) și numărul de operații booleene ale etapei. RSS-ul maxim e
+# un vârf pe toată viața procesului, deci e raportat o singură dată, la final.
+
+SKIP_PATTERNS = ('none', 'legacy', 'sparse')
+STAGES = ('map_builder', 'beams', 'fenestration', 'building')
+
+
+def grid_axes(n, span=4.0):
+    return [i * span for i in range(n)]
+
+
+def grid_matrix(n, span=4.0):
+    X, Y = np.meshgrid(grid_axes(n, span), grid_axes(n, span))
+    return np.dstack((X, Y))
+
+
+def column_skip_pattern(name, n):
+    """Mască (n, n) de noduri fără stâlp."""
+    mask = np.zeros((n, n), dtype=bool)
+    if name == 'legacy':
+        # Aceleași noduri ca în clădirea implicită 4x4
+        mask[2, 0] = mask[2, n - 1] = True
+    elif name == 'sparse':
+        i, j = np.mgrid[1:n - 1, 1:n - 1]
+        mask[1:n - 1, 1:n - 1] = (i + 2 * j) % 5 == 0
+    elif name != 'none':
+        raise ValueError(f"Unknown skip pattern: {name}")
+    return mask
+
+
+def synthetic_fenestration_params(m, count):
+    """`count` ferestre pe deschiderile rețelei, întâi pe contur, apoi în interior."""
+    rows, cols = m.shape[:2]
+    bays = [(i, j, 0) for i in range(rows) for j in range(cols - 1)]
+    bays += [(i, j, 90) for i in range(rows - 1) for j in range(cols)]
+    bays.sort(key=lambda bay: not (bay[0] in (0, rows - 1) or bay[1] in (0, cols - 1)))
+    return [(*window_placement(m, i, j, angle, 1.0, 0.9), 1.2, 1.2, 0.05, "single")
+            for i, j, angle in itertools.islice(itertools.cycle(bays), count)]
+
+
+def max_rss_kb():
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def clear_caches():
+    SHAPE_CACHE.clear()
+    VOLUME_CACHE.clear()
+
+
+def measure(func, cold=True, memory=True):
+    """
+    Rulează func pentru timp și, dacă memory=True, încă o dată sub tracemalloc
+    (care ar încetini prima trecere); întoarce (rezultatul primei treceri, metrici).
+    Cu cold=False, a doua trecere găsește cache-urile umplute de prima.
+    """
+    if cold:
+        clear_caches()
+    reset_boolean_timings()
+    start = time.perf_counter()
+    value = func()
+    metrics = {
+        'seconds': time.perf_counter() - start,
+        'booleans': len(BOOLEAN_TIMINGS),
+        'boolean_seconds': sum(seconds for _, _, seconds in BOOLEAN_TIMINGS),
+    }
+    if memory:
+        if cold:
+            clear_caches()
+        tracemalloc.start()
+        try:
+            func()
+            metrics['peak_bytes'] = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return value, metrics
+
+
+def bench_map_builder(m, skip):
+    mask = skip_mask(m.shape[:2], skip)
+    return lambda: (column_list(m, mask), create_column_points(m, mask, 0.25))
+
+
+def bench_beams(m, skip):
+    skipx = beam_skips(skip)
+
+    def run():
+        x_beams, y_beams = create_beam_pairs(beam_points(m, 0.25), skipx, column_skip=skip)
+        return create_beam_contours(np.concatenate([x_beams, y_beams]))
+    return run
+
+
+def bench_fenestration(m, windows):
+    params = synthetic_fenestration_params(m, windows)
+    return lambda: [build_window(p) for p in params]
+
+
+def run(sizes, windows, skips, coverings, stages, max_building_grid=16, cold=True, memory=True):
+    rows = []
+
+    def emit(row):
+        rows.append(row)
+        print(json.dumps(row))
+        sys.stdout.flush()
+
+    for n in sizes:
+        m = grid_matrix(n)
+        grid = f"{n}x{n}"
+        for skip_name in skips:
+            skip = column_skip_pattern(skip_name, n)
+            for stage, factory in [('map_builder', bench_map_builder), ('beams', bench_beams)]:
+                if stage in stages:
+                    value, metrics = measure(factory(m, skip), cold, memory)
+                    extra = {'beams': len(value)} if stage == 'beams' else {'columns': len(value[0])}
+                    emit({'stage': stage, 'grid': grid, 'skip': skip_name, **extra, **metrics})
+
+        if 'fenestration' in stages:
+            for count in windows:
+                _, metrics = measure(bench_fenestration(m, count), cold, memory)
+                emit({'stage': 'fenestration', 'grid': grid, 'windows': count, **metrics})
+
+        if 'building' in stages and n <= max_building_grid:
+            for count, skip_name, with_coverings in itertools.product(windows, skips, coverings):
+                params = synthetic_fenestration_params(m, count)
+                skip = column_skip_pattern(skip_name, n)
+                # Fiecare trecere are cronometrul ei; defalcarea e cea a trecerii cronometrate
+                timers = []
+
+                def build(params=params, skip=skip, with_coverings=with_coverings):
+                    timers.append(StageTimer())
+                    return build_building(
+                        grid_axes(n), grid_axes(n),
+                        show_interior_covering=with_coverings,
+                        show_exterior_covering=with_coverings,
+                        show_roof=False,
+                        timer=timers[-1],
+                        fenestration_params=params,
+                        column_skip=skip,
+                    )
+                result, metrics = measure(build, cold, memory)
+                emit({'stage': 'building', 'grid': grid, 'windows': count, 'skip': skip_name,
+                      'coverings': with_coverings, 'elements': len(result.elements),
+                      **metrics, 'breakdown': timers[0].summary()})
+
+    emit({'stage': 'process', 'max_rss_kb': max_rss_kb()})
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark pentru etapele generării, fără afișare.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[4, 8, 16, 32, 50], help="Numărul de axe pe fiecare direcție")
+    parser.add_argument('--windows', type=int, nargs='+', default=[0, 12, 48])
+    parser.add_argument('--skips', nargs='+', choices=SKIP_PATTERNS, default=list(SKIP_PATTERNS))
+    parser.add_argument('--coverings', choices=('on', 'off', 'both'), default='both')
+    parser.add_argument('--stages', nargs='+', choices=STAGES, default=list(STAGES))
+    parser.add_argument('--max-building-grid', type=int, default=16,
+                        help="Clădirea completă rulează doar pentru rețele până la această dimensiune")
+    parser.add_argument('--warm', action='store_true', help="Nu goli cache-urile de forme și volume între etape")
+    parser.add_argument('--no-memory', action='store_true',
+                        help="Sari peste trecerea sub tracemalloc (fiecare etapă rulează o singură dată)")
+    parser.add_argument('--output', help="Scrie și o listă JSON cu toate rândurile")
+    args = parser.parse_args(argv)
+
+    coverings = {'on': [True], 'off': [False], 'both': [True, False]}[args.coverings]
+    rows = run(args.sizes, args.windows, args.skips, coverings, args.stages,
+               args.max_building_grid, cold=not args.warm, memory=not args.no_memory)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(rows, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
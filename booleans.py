@@ -0,0 +1,207 @@
+import time
+import numpy as np
+from OCC.Core.BRepAlgoAPI import BRepAlgoAPI_Cut
+from OCC.Core.BOPAlgo import BOPAlgo_GlueOff, BOPAlgo_GlueShift, BOPAlgo_GlueFull
+from OCC.Core.TopTools import TopTools_ListOfShape
+from OCC.Core.Bnd import Bnd_Box
+from OCC.Core.BRepBndLib import brepbndlib_Add
+from progress import current_range
+
+GLUE_MODES = {
+    'off': BOPAlgo_GlueOff,
+    'shift': BOPAlgo_GlueShift,
+    'full': BOPAlgo_GlueFull,
+}
+
+
+class BooleanSettings:
+    """
+    Opțiunile OCC aplicate unei operații booleene.
+
+    Args:
+        parallel (bool): Rulează algoritmul pe mai multe fire (SetRunParallel).
+        fuzzy (float): Toleranța suplimentară pentru fețe aproape coplanare (SetFuzzyValue).
+        glue (str): 'off', 'shift' sau 'full'. Modul glue e corect doar când
+            argumentele se ating pe fețe coincidente, fără să se intersecteze.
+        use_obb (bool): Folosește cutii orientate pentru a elimina rapid perechile disjuncte.
+    """
+
+    def __init__(self, parallel=True, fuzzy=1e-5, glue='off', use_obb=True):
+        if glue not in GLUE_MODES:
+            raise ValueError(f"Unknown glue mode: {glue}")
+        self.parallel = parallel
+        self.fuzzy = fuzzy
+        self.glue = glue
+        self.use_obb = use_obb
+
+    def key(self):
+        """Opțiunile care pot schimba rezultatul (nu și `parallel`), pentru cheile de cache."""
+        return (self.fuzzy, self.glue, self.use_obb)
+
+    def copy(self, **overrides):
+        values = dict(parallel=self.parallel, fuzzy=self.fuzzy, glue=self.glue, use_obb=self.use_obb)
+        values.update(overrides)
+        return BooleanSettings(**values)
+
+    def apply(self, algo):
+        # Argumentele sunt forme memoizate, cu TShape-uri partajate între instanțe
+        # și afișate în paralel: operația nu are voie să le modifice toleranțele
+        algo.SetNonDestructive(True)
+        algo.SetRunParallel(self.parallel)
+        if self.fuzzy > 0:
+            algo.SetFuzzyValue(self.fuzzy)
+        algo.SetGlue(GLUE_MODES[self.glue])
+        algo.SetUseOBB(self.use_obb)
+
+
+# Setările implicite și suprascrierile per loc de apel (site).
+# Site-urile folosite: walls, exterior_covering, interior_coverings,
+# foundation, elevation, fenestration_openings.
+DEFAULT_SETTINGS = BooleanSettings()
+SITE_SETTINGS = {}
+
+# (site, număr de unelte, secunde) pentru fiecare operație executată de la
+# ultimul reset_boolean_timings(); BuildingModel.update îl golește la fiecare construcție
+BOOLEAN_TIMINGS = []
+
+
+def configure_booleans(site=None, **options):
+    """Schimbă setările implicite (site=None) sau pe cele ale unui singur site."""
+    global DEFAULT_SETTINGS
+    if site is None:
+        DEFAULT_SETTINGS = DEFAULT_SETTINGS.copy(**options)
+    else:
+        SITE_SETTINGS[site] = settings_for(site).copy(**options)
+
+
+def settings_for(site):
+    return SITE_SETTINGS.get(site, DEFAULT_SETTINGS)
+
+
+def reset_boolean_timings():
+    BOOLEAN_TIMINGS.clear()
+
+
+def boolean_report():
+    """Agregă timpii pe site: număr de operații, unelte și secunde totale."""
+    report = {}
+    for site, tools, seconds in BOOLEAN_TIMINGS:
+        entry = report.setdefault(site, {'operations': 0, 'tools': 0, 'seconds': 0.0})
+        entry['operations'] += 1
+        entry['tools'] += tools
+        entry['seconds'] += seconds
+    return report
+
+
+def shape_bounds(shape):
+    """Cutia de încadrare aliniată cu axele: (xmin, ymin, zmin, xmax, ymax, zmax)."""
+    box = Bnd_Box()
+    brepbndlib_Add(shape, box)
+    return box.Get()
+
+
+def shape_center(shape):
+    """Centrul (x, y, z) al cutiei de încadrare a unei forme."""
+    xmin, ymin, zmin, xmax, ymax, zmax = shape_bounds(shape)
+    return (xmin + xmax) / 2, (ymin + ymax) / 2, (zmin + zmax) / 2
+
+
+class BoxIndex:
+    """
+    Index de cutii de încadrare (AABB) pentru o listă de unelte.
+
+    Cutiile se calculează o singură dată; query() compară cutia țintei cu toate
+    cutiile deodată (NumPy) și întoarce doar uneltele care o pot intersecta.
+    """
+
+    def __init__(self, shapes):
+        self.shapes = list(shapes)
+        bounds = np.array([shape_bounds(s) for s in self.shapes], dtype=float).reshape(-1, 6)
+        self.mins = bounds[:, :3]
+        self.maxs = bounds[:, 3:]
+
+    def query(self, shape):
+        bounds = shape_bounds(shape)
+        target_min = np.array(bounds[:3])
+        target_max = np.array(bounds[3:])
+        overlap = np.all((self.mins <= target_max) & (self.maxs >= target_min), axis=1)
+        return [self.shapes[i] for i in np.flatnonzero(overlap)]
+
+    def __len__(self):
+        return len(self.shapes)
+
+
+def _morton_key(x, y, cell, bits=16):
+    # Intercalează biții lui x și y: formele apropiate ajung alăturate în listă
+    ix = max(0, min(int(x / cell), (1 << bits) - 1))
+    iy = max(0, min(int(y / cell), (1 << bits) - 1))
+    key = 0
+    for b in range(bits):
+        key |= ((ix >> b) & 1) << (2 * b) | ((iy >> b) & 1) << (2 * b + 1)
+    return key
+
+
+def order_by_locality(shapes, cell=0.5):
+    """Sortează formele după curba Z (Morton) a centrelor, în planul XY."""
+    if len(shapes) < 2:
+        return list(shapes)
+    centers = [shape_center(s) for s in shapes]
+    xmin = min(c[0] for c in centers)
+    ymin = min(c[1] for c in centers)
+    keys = [_morton_key(c[0] - xmin, c[1] - ymin, cell) for c in centers]
+    return [shapes[i] for _, i in sorted(zip(keys, range(len(shapes))))]
+
+
+def to_shape_list(shapes):
+    shape_list = TopTools_ListOfShape()
+    for shape in shapes:
+        shape_list.Append(shape)
+    return shape_list
+
+
+def cut_many(shape, tools, order=True, site='default', settings=None, progress=None):
+    """
+    Scade toate uneltele dintr-o formă printr-o singură operație booleană.
+
+    Echivalent cu BRepAlgoAPI_Cut aplicat în lanț, dar intersecțiile se
+    calculează o singură dată în loc să fie refăcute pe un rezultat tot mai mare.
+
+    Args:
+        shape (TopoDS_Shape): Forma din care se taie.
+        tools (list of TopoDS_Shape): Formele care se scad.
+        order (bool): Ordonează uneltele după localitate înainte de tăiere.
+        site (str): Numele locului de apel, pentru setări și raportul de timpi.
+        settings (BooleanSettings): Suprascrie setările site-ului pentru acest apel.
+        progress (ProgressRange): Intervalul de progres; implicit cel activ pe fir
+            (progress.using). Anularea e verificată înainte și după operație.
+
+    Returns:
+        TopoDS_Shape: Rezultatul tăierii.
+    """
+    progress = progress or current_range()
+    if progress is not None:
+        progress.check()
+    tools = [t for t in tools if t is not None]
+    if not tools:
+        return shape
+    if order:
+        tools = order_by_locality(tools)
+
+    start = time.perf_counter()
+    cut = BRepAlgoAPI_Cut()
+    (settings or settings_for(site)).apply(cut)
+    cut.SetArguments(to_shape_list([shape]))
+    cut.SetTools(to_shape_list(tools))
+    cut.Build()
+    BOOLEAN_TIMINGS.append((site, len(tools), time.perf_counter() - start))
+    if not cut.IsDone():
+        raise RuntimeError(f"Boolean cut failed ({site})")
+    if progress is not None:
+        progress.done(site)
+        progress.check()
+    return cut.Shape()
+
+
+def cut(shape, tool, site='default', settings=None, progress=None):
+    """Tăiere cu o singură unealtă, cu aceleași setări și raportare ca cut_many."""
+    return cut_many(shape, [tool], order=False, site=site, settings=settings, progress=progress)
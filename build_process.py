@@ -0,0 +1,330 @@
+import os
+import tempfile
+from OCC.Core.BinTools import bintools_Write, bintools_Read
+from OCC.Core.BRep import BRep_Builder
+from OCC.Core.TopoDS import TopoDS_Compound, TopoDS_Shape, TopoDS_Iterator
+from OCC.Core.TopLoc import TopLoc_Location
+from OCC.Core.gp import gp_Trsf
+
+from building_engine import BuildingModel, BuildingResult, write_dxf, write_volumes
+from disk_cache import DiskCache, DEFAULT_CACHE_DIR
+from meshing import premesh
+from profiling import StageTimer
+from progress import CancelToken, OperationCancelled, ProgressRange
+from shape_cache import cache_stats
+
+# Procesul de construcție pentru regenerarea „live”. Apelurile OCC țin GIL-ul,
+# deci pe un fir al procesului UI o operație booleană lungă ar bloca și
+# interfața; aici modelul (BuildingModel) trăiește într-un proces separat, care
+# primește comenzi și trimite înapoi doar formele elementelor schimbate,
+# serializate cu BinTools (împreună cu triangularea). Prototipurile (TShape fără
+# locație) sunt trimise o singură dată și apoi referite după ID, cu locația
+# fiecărei instanțe, ca InstancedDisplay să le poată partaja și în procesul UI.
+# Partea Qt (firul care citește mesajele) e în build_worker.py.
+
+# Partea din bară rezervată construcției; restul e triangularea finală
+BUILD_FRACTION = 0.9
+# Pasul minim între două raportări, ca procesul UI să nu fie inundat de mesaje
+PROGRESS_STEP = 0.01
+
+
+class BuildRequest:
+    """
+    Args:
+        x_interax, y_interax (list of float): Axele rețelei.
+        options (dict): Argumentele pentru BuildingModel.update.
+        deflection (float): Deflecția cu care sunt triangulate formele noi.
+        angle (float): Unghiul de deviație al triangulării.
+        fit (bool): Încadrează vederea după afișare.
+    """
+
+    def __init__(self, x_interax, y_interax, options, deflection, angle, fit=False):
+        self.x_interax = list(x_interax)
+        self.y_interax = list(y_interax)
+        self.options = dict(options)
+        self.deflection = deflection
+        self.angle = angle
+        self.fit = fit
+        self.generation = 0
+        self.epoch = 0
+
+
+class RefineRequest:
+    """Retriangularea tuturor elementelor modelului, în procesul de construcție, după o pauză."""
+
+    def __init__(self, deflection, angle):
+        self.deflection = deflection
+        self.angle = angle
+        self.generation = 0
+        self.epoch = 0
+
+
+def write_outputs(result, timer):
+    """Fișierele scrise după fiecare construcție din GUI (în procesul de construcție); ambele sunt suprascrise."""
+    with timer.stage('dxf'):
+        write_dxf(result, "dreptunghi_cu_hatch.dxf")
+    with timer.stage('volumes.json', 'write_volumes'):
+        write_volumes(result.volumes, 'volumes.json')
+
+
+def write_blob(shapes):
+    """Serializează formele (ca un singur compus BinTools) și întoarce octeții."""
+    compound = TopoDS_Compound()
+    builder = BRep_Builder()
+    builder.MakeCompound(compound)
+    for shape in shapes:
+        builder.Add(compound, shape)
+    fd, path = tempfile.mkstemp(suffix='.bin')
+    os.close(fd)
+    try:
+        bintools_Write(compound, path)
+        with open(path, 'rb') as f:
+            return f.read()
+    finally:
+        os.remove(path)
+
+
+def read_blob(blob):
+    """Inversul lui write_blob: formele, în ordinea în care au fost scrise."""
+    fd, path = tempfile.mkstemp(suffix='.bin')
+    with os.fdopen(fd, 'wb') as f:
+        f.write(blob)
+    try:
+        compound = TopoDS_Shape()
+        if not bintools_Read(compound, path):
+            raise RuntimeError("Cannot read shapes sent by the build process")
+    finally:
+        os.remove(path)
+    shapes = []
+    iterator = TopoDS_Iterator(compound)
+    while iterator.More():
+        shapes.append(iterator.Value())
+        iterator.Next()
+    return shapes
+
+
+def location_values(shape):
+    """Cele 12 valori ale transformării formei (rânduri 1..3, coloane 1..4), sau None pentru identitate."""
+    location = shape.Location()
+    if location.IsIdentity():
+        return None
+    trsf = location.Transformation()
+    return tuple(trsf.Value(row, col) for row in (1, 2, 3) for col in (1, 2, 3, 4))
+
+
+def placed(prototype, values):
+    if values is None:
+        return prototype
+    trsf = gp_Trsf()
+    trsf.SetValues(*values)
+    return prototype.Moved(TopLoc_Location(trsf))
+
+
+class ElementSnapshot:
+    """Copia din procesul UI a unui element construit; are atributele folosite de BuildingResult și de afișare."""
+
+    def __init__(self, element_id, digest, volume_group, volume, shapes):
+        self.element_id = element_id
+        self.digest = digest
+        self.volume_group = volume_group
+        self.volume = volume
+        self.shapes = shapes
+
+
+class ShapePacker:
+    """Partea procesului de construcție: atribuie ID-uri prototipurilor și le serializează o singură dată."""
+
+    def __init__(self):
+        # Prototip (formă fără locație) -> ID; TopoDS_Shape are __hash__/__eq__ pe TShape + Location
+        self.ids = {}
+        self.next_id = 0
+
+    def pack(self, elements):
+        new = []
+        records = []
+        for element in elements:
+            entries = []
+            for group, shape in element.shapes:
+                prototype = shape.Located(TopLoc_Location())
+                shape_id = self.ids.get(prototype)
+                if shape_id is None:
+                    shape_id = self.ids[prototype] = self.next_id
+                    self.next_id += 1
+                    new.append((shape_id, prototype))
+                entries.append((group, shape_id, location_values(shape)))
+            records.append((element.element_id, element.digest, element.volume_group, element.volume, entries))
+        return {
+            'elements': records,
+            'new_ids': [shape_id for shape_id, _ in new],
+            'blob': write_blob([prototype for _, prototype in new]) if new else None,
+        }
+
+    def retain(self, elements):
+        """Uită prototipurile nefolosite de `elements`; întoarce ID-urile rămase (vezi ShapeUnpacker.retain)."""
+        live = {shape.Located(TopLoc_Location()) for element in elements for _, shape in element.shapes}
+        self.ids = {prototype: shape_id for prototype, shape_id in self.ids.items() if prototype in live}
+        return sorted(self.ids.values())
+
+    def forget(self):
+        """Următorul pack retrimite toate prototipurile (de ex. după o retriangulare)."""
+        self.ids.clear()
+
+
+class ShapeUnpacker:
+    """Partea procesului UI: prototipurile primite, după ID, și elementele reconstruite din ele."""
+
+    def __init__(self):
+        self.prototypes = {}
+
+    def unpack(self, payload):
+        if payload['blob'] is not None:
+            for shape_id, shape in zip(payload['new_ids'], read_blob(payload['blob'])):
+                self.prototypes[shape_id] = shape
+        return [ElementSnapshot(element_id, digest, volume_group, volume,
+                                [(group, placed(self.prototypes[shape_id], values))
+                                 for group, shape_id, values in entries])
+                for element_id, digest, volume_group, volume, entries in payload['elements']]
+
+    def retain(self, shape_ids):
+        keep = set(shape_ids)
+        self.prototypes = {shape_id: shape for shape_id, shape in self.prototypes.items() if shape_id in keep}
+
+
+def snapshot_result(payload, elements, previous):
+    """
+    BuildingResult în procesul UI: elementele schimbate (`elements`) peste cele
+    din construcția anterioară (`previous`), în ordinea din proces.
+    """
+    changed = {element.element_id: element for element in elements}
+    ordered = {element_id: changed.get(element_id) or previous[element_id] for element_id in payload['order']}
+    return BuildingResult(payload['intersection_matrix'], payload['column_points'], ordered,
+                          payload['changed'], payload['removed'])
+
+
+class ProcessBuilder:
+    """
+    Execută comenzile în procesul de construcție.
+
+    Args:
+        connection: Capătul de scriere al conexiunii spre procesul UI.
+        latest: multiprocessing.Value cu generația cererii curente; orice cerere
+            cu altă generație e învechită și e oprită după operația OCC în curs.
+        cache_dir (str): Directorul DiskCache; None = fără cache pe disc.
+        after_build (callable): after_build(result, timer), după fiecare construcție terminată.
+    """
+
+    def __init__(self, connection, latest, cache_dir=DEFAULT_CACHE_DIR, after_build=None):
+        self.connection = connection
+        self.latest = latest
+        self.cache_dir = cache_dir
+        self.after_build = after_build
+        self.packer = ShapePacker()
+        self.model = self.new_model()
+
+    def new_model(self):
+        return BuildingModel(DiskCache(self.cache_dir) if self.cache_dir else None)
+
+    def send(self, kind, request, *args):
+        self.connection.send((kind, request) + args)
+
+    def is_stale(self, request):
+        return request.generation != self.latest.value
+
+    def build(self, request):
+        if self.is_stale(request):
+            self.send('cancelled', request)
+            return
+        timer = StageTimer()
+        streamed = set()
+        token = CancelToken(lambda: self.is_stale(request))
+        last = [0.0]
+
+        def report(value, label):
+            if value - last[0] >= PROGRESS_STEP or value >= 1.0:
+                last[0] = value
+                self.send('progressed', request, value, label)
+
+        def on_stage(stage, elements):
+            with timer.stage(f"mesh {stage}", 'mesh') as event:
+                event['prototypes'] = premesh(
+                    [shape for element in elements for _, shape in element.shapes],
+                    request.deflection, request.angle, progress=ProgressRange(token=token))
+            with timer.stage(f"pack {stage}", 'pack'):
+                payload = self.packer.pack(elements)
+            streamed.update(element.element_id for element in elements)
+            self.send('staged', request, stage, payload)
+
+        try:
+            with timer.stage('build'):
+                result = self.model.update(request.x_interax, request.y_interax, timer=timer,
+                                           cancel=token.is_cancelled, on_stage=on_stage,
+                                           progress=ProgressRange(0.0, BUILD_FRACTION, report, token),
+                                           mesh=(request.deflection, request.angle),
+                                           **request.options)
+            # Modelul a avansat deja: triangularea finală nu mai e anulată
+            with timer.stage('mesh') as event:
+                event['prototypes'] = premesh(
+                    [shape for element_id in result.changed if element_id not in streamed
+                     for _, shape in result.elements[element_id].shapes],
+                    request.deflection, request.angle,
+                    progress=ProgressRange(BUILD_FRACTION, 1.0, report, label='mesh'))
+            if self.after_build is not None:
+                self.after_build(result, timer)
+            with timer.stage('pack', 'pack'):
+                # Elementele trimise pe etape sunt retrimise doar ca referințe la prototipuri
+                payload = self.packer.pack([result.elements[element_id] for element_id in result.changed])
+                payload.update(
+                    order=list(result.elements),
+                    changed=result.changed,
+                    removed=result.removed,
+                    intersection_matrix=result.intersection_matrix,
+                    column_points=result.column_points,
+                    live=self.packer.retain(result.elements.values()),
+                    cache_stats=cache_stats(),
+                )
+        except OperationCancelled:
+            self.send('cancelled', request)
+            return
+        except Exception as exc:
+            self.send('failed', request, f"{type(exc).__name__}: {exc}")
+            return
+        self.send('finished', request, payload, timer)
+
+    def refine(self, request):
+        """Retriangulează și retrimite toate formele; abandonată dacă între timp a sosit o construcție."""
+        if self.is_stale(request):
+            return
+        timer = StageTimer()
+        elements = list(self.model.elements.values())
+        try:
+            with timer.stage('refine', 'mesh') as event:
+                event['prototypes'] = premesh(
+                    [shape for element in elements for _, shape in element.shapes],
+                    request.deflection, request.angle,
+                    progress=ProgressRange(token=CancelToken(lambda: self.is_stale(request))))
+        except OperationCancelled:
+            return
+        with timer.stage('pack', 'pack'):
+            self.packer.forget()
+            payload = self.packer.pack(elements)
+            payload['live'] = self.packer.retain(elements)
+        self.send('refined', request, payload, timer)
+
+    def reset(self, request):
+        self.model = self.new_model()
+        self.packer.retain([])
+        self.send('reset', request)
+
+
+def serve(commands, connection, latest, cache_dir=DEFAULT_CACHE_DIR, after_build=None):
+    """Punctul de intrare al procesului: execută comenzile primite până la 'stop'."""
+    builder = ProcessBuilder(connection, latest, cache_dir, after_build)
+    while True:
+        try:
+            command, request = commands.recv()
+        except EOFError:
+            return
+        if command == 'stop':
+            builder.send('stopped', None)
+            return
+        getattr(builder, command)(request)
@@ -0,0 +1,310 @@
+import traceback
+from multiprocessing import get_context
+from PyQt5.QtCore import QCoreApplication, QObject, QThread, QTimer, pyqtSignal, pyqtSlot
+
+from build_process import ShapeUnpacker, serve, snapshot_result
+from disk_cache import DEFAULT_CACHE_DIR
+
+# Regenerare „live”: editările sunt grupate (debounce), construcția rulează
+# într-un proces separat (build_process.py), iar o cerere nouă anulează
+# construcțiile vechi. Un fir al procesului UI citește mesajele procesului,
+# reface formele primite și le trimite interfeței prin semnale; firul UI doar
+# le afișează. Elementele fiecărei etape (ELEMENT_STAGES) sunt trimise și
+# parțial, imediat ce etapa e gata. Progresul (0..1) e raportat prin
+# `progressed`; anularea e verificată în jurul fiecărei operații booleene și
+# triangulări (vezi progress.py).
+
+# O operație OCC în curs nu verifică anularea. Dacă după cancel() procesul nu
+# confirmă oprirea în acest interval, e oprit forțat și repornit: modelul din
+# proces se pierde, dar DiskCache-ul face reconstrucția următoare ieftină.
+CANCEL_GRACE_MS = 500
+
+
+class BuildWorker(QObject):
+    """
+    Citește mesajele procesului de construcție (pe firul lui) și le transformă în semnale.
+
+    Rezultatele sunt BuildingResult cu ElementSnapshot în loc de Element; în
+    plus au `cache_stats`, statisticile cache-ului de forme din proces.
+    """
+
+    finished = pyqtSignal(object, object, object)  # cerere, BuildingResult, StageTimer
+    staged = pyqtSignal(object, str, object)  # cerere, etapă, elementele reconstruite
+    progressed = pyqtSignal(object, float, str)  # cerere, valoare 0..1, etichetă
+    refined = pyqtSignal(object, object, object)  # RefineRequest, elemente (ID -> ElementSnapshot), StageTimer
+    cancelled = pyqtSignal(object)
+    failed = pyqtSignal(object, str)
+    exited = pyqtSignal()  # procesul s-a oprit neașteptat
+
+    def __init__(self, connection):
+        super().__init__()
+        self.connection = connection
+        self.unpacker = ShapeUnpacker()
+        # Elementele ultimei construcții terminate, după ID
+        self.elements = {}
+
+    @pyqtSlot()
+    def run(self):
+        while True:
+            try:
+                kind, request, *args = self.connection.recv()
+            except (EOFError, OSError):
+                self.exited.emit()
+                return
+            if kind == 'stopped':
+                return
+            try:
+                getattr(self, f"_{kind}")(request, *args)
+            except Exception as exc:
+                traceback.print_exc()
+                if kind == 'finished':
+                    self.failed.emit(request, f"{type(exc).__name__}: {exc}")
+
+    def _progressed(self, request, value, label):
+        self.progressed.emit(request, value, label)
+
+    def _staged(self, request, stage, payload):
+        self.staged.emit(request, stage, self.unpacker.unpack(payload))
+
+    def _finished(self, request, payload, timer):
+        with timer.stage('unpack', 'pack'):
+            result = snapshot_result(payload, self.unpacker.unpack(payload), self.elements)
+            self.unpacker.retain(payload['live'])
+        result.cache_stats = payload['cache_stats']
+        self.elements = result.elements
+        self.finished.emit(request, result, timer)
+
+    def _refined(self, request, payload, timer):
+        with timer.stage('unpack', 'pack'):
+            elements = {element.element_id: element for element in self.unpacker.unpack(payload)}
+            self.unpacker.retain(payload['live'])
+        self.elements = elements
+        self.refined.emit(request, elements, timer)
+
+    def _cancelled(self, request):
+        self.cancelled.emit(request)
+
+    def _failed(self, request, message):
+        self.failed.emit(request, message)
+
+    def _reset(self, request):
+        self.unpacker.retain([])
+        self.elements = {}
+
+
+class LiveBuilder(QObject):
+    """
+    Trimite cereri de construcție procesului de construcție, din firul UI.
+
+    schedule() amână cererea cu `debounce_ms` (fiecare editare nouă repornește
+    temporizatorul), submit() o trimite imediat. Orice cerere nouă face cererile
+    anterioare învechite: cele încă neîncepute sunt sărite, iar cea în curs e
+    oprită după operația booleană sau triangularea în curs (cancel() oprește și
+    operația în curs, vezi CANCEL_GRACE_MS). Rezultatele terminate sunt emise prin `ready`,
+    chiar dacă între timp a sosit o cerere nouă: modelul a avansat deja, iar
+    următorul rezultat conține doar diferențele față de acesta.
+
+    Args:
+        cache_dir (str): DiskCache-ul procesului de construcție; None = fără cache pe disc.
+        after_build (callable): Funcție la nivel de modul (trimisă procesului),
+            apelată acolo cu (result, timer) după fiecare construcție terminată.
+    """
+
+    ready = pyqtSignal(object, object, object)  # cerere, BuildingResult, StageTimer
+    staged = pyqtSignal(object, str, object)  # cerere, etapă, elemente (doar pentru cererea curentă)
+    progressed = pyqtSignal(float, str)  # valoare 0..1, etichetă (doar pentru cererea curentă)
+    refined = pyqtSignal(object, object, object)  # RefineRequest, elemente, StageTimer (dacă nu a sosit o construcție între timp)
+    error = pyqtSignal(object, str)
+    # Cererea anulată sau eșuată (None dacă procesul a murit) după care nu mai urmează
+    # nicio construcție: elementele trimise pe etape nu mai sunt corectate de un rezultat
+    abandoned = pyqtSignal(object)
+    busy_changed = pyqtSignal(bool)
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, debounce_ms=300, after_build=None, parent=None):
+        super().__init__(parent)
+        self.generation = 0
+        self.epoch = 0
+        self.running = 0
+        self.pending_request = None
+        self.cache_dir = cache_dir
+        self.after_build = after_build
+        self.stopping = False
+
+        # Procesul citește generația curentă direct din memoria partajată
+        self.mp = get_context('spawn')
+        self.latest = self.mp.Value('i', 0, lock=False)
+        self.start_process()
+
+        self.debounce = QTimer(self)
+        self.debounce.setSingleShot(True)
+        self.debounce.setInterval(debounce_ms)
+        self.debounce.timeout.connect(self._submit_pending)
+
+        self.cancel_timer = QTimer(self)
+        self.cancel_timer.setSingleShot(True)
+        self.cancel_timer.setInterval(CANCEL_GRACE_MS)
+        self.cancel_timer.timeout.connect(self._kill_cancelled)
+        self.cancelled_generation = None
+
+        # Widget-ul proprietar poate fi un tab (main.py), al cărui closeEvent nu rulează:
+        # procesul și firul sunt oprite oricum la ieșirea din aplicație
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.stop)
+
+    def start_process(self):
+        commands, self.commands = self.mp.Pipe(duplex=False)
+        self.results, results = self.mp.Pipe(duplex=False)
+        self.process = self.mp.Process(
+            target=serve, args=(commands, results, self.latest, self.cache_dir, self.after_build), daemon=True)
+        self.process.start()
+        commands.close()
+        results.close()
+
+        self.thread = QThread()
+        self.worker = BuildWorker(self.results)
+        self.worker.moveToThread(self.thread)
+        self.thread.started.connect(self.worker.run)
+        self.worker.finished.connect(self._on_finished)
+        self.worker.staged.connect(self._on_staged)
+        self.worker.progressed.connect(self._on_progressed)
+        self.worker.refined.connect(self._on_refined)
+        self.worker.cancelled.connect(self._on_cancelled)
+        self.worker.failed.connect(self._on_failed)
+        self.worker.exited.connect(self._on_exited)
+        self.thread.start()
+
+    def schedule(self, request):
+        self.pending_request = request
+        self.debounce.start()
+
+    def submit(self, request):
+        self.debounce.stop()
+        self.pending_request = None
+        self.generation += 1
+        request.generation = self.generation
+        request.epoch = self.epoch
+        self.latest.value = self.generation
+        self.running += 1
+        if self.running == 1:
+            self.busy_changed.emit(True)
+        self.commands.send(('build', request))
+
+    def refine(self, request):
+        """Trimite o retriangulare; orice construcție trimisă după ea o face învechită."""
+        request.generation = self.generation
+        request.epoch = self.epoch
+        self.commands.send(('refine', request))
+
+    def _submit_pending(self):
+        if self.pending_request is not None:
+            self.submit(self.pending_request)
+
+    def reset_model(self):
+        """Pornește un model nou după construcțiile în curs; rezultatele lor sunt ignorate."""
+        self.epoch += 1
+        self.latest.value = self.generation = self.generation + 1
+        self.commands.send(('reset', None))
+
+    def cancel(self):
+        """
+        Abandonează cererea amânată și pe cele trimise; modelul rămâne la ultima
+        construcție terminată, cu excepția cazului în care procesul trebuie
+        repornit (vezi CANCEL_GRACE_MS).
+        """
+        self.debounce.stop()
+        self.pending_request = None
+        self.latest.value = self.generation = self.generation + 1
+        if self.running:
+            self.cancelled_generation = self.generation
+            self.cancel_timer.start()
+
+    def _kill_cancelled(self):
+        # O cerere trimisă după anulare ar fi oprită odată cu procesul: atunci se așteaptă
+        if self.stopping or not self.running or self.generation != self.cancelled_generation:
+            return
+        self.process.terminate()
+        self.restart()
+
+    def is_busy(self):
+        return self.running > 0
+
+    def _on_staged(self, request, stage, elements):
+        # Etapele unei cereri deja înlocuite nu mai merită afișate
+        if request.epoch == self.epoch and request.generation == self.generation:
+            self.staged.emit(request, stage, elements)
+
+    def _on_progressed(self, request, value, label):
+        if request.epoch == self.epoch and request.generation == self.generation:
+            self.progressed.emit(value, label)
+
+    def _on_refined(self, request, elements, timer):
+        if request.epoch == self.epoch and request.generation == self.generation:
+            self.refined.emit(request, elements, timer)
+
+    def _on_finished(self, request, result, timer):
+        self._on_done(request)
+        if request.epoch == self.epoch:
+            self.ready.emit(request, result, timer)
+
+    def _on_cancelled(self, request):
+        self._on_done(request)
+        self._check_abandoned(request)
+
+    def _on_failed(self, request, message):
+        self._on_done(request)
+        if request.epoch == self.epoch:
+            self.error.emit(request, message)
+        self._check_abandoned(request)
+
+    def _check_abandoned(self, request):
+        if request.epoch == self.epoch and not self.running and self.pending_request is None:
+            self.abandoned.emit(request)
+
+    def _on_done(self, request):
+        self.running -= 1
+        if self.running == 0:
+            self.busy_changed.emit(False)
+
+    def _on_exited(self):
+        """Procesul a murit (de ex. o eroare fatală în OCC): cererile în curs sunt pierdute, se pornește altul."""
+        # Semnalul unui proces deja înlocuit (de ex. oprit de _kill_cancelled) sosește după repornire
+        if self.stopping or self.sender() is not self.worker:
+            return
+        self.restart(f"Build process exited (code {self.process.exitcode}); restarted")
+
+    def restart(self, message=None):
+        """Pornește un proces nou, cu un model gol; procesul vechi trebuie să fie oprit sau pe cale să se oprească."""
+        self.cancel_timer.stop()
+        self.process.join(1)
+        self.thread.quit()
+        self.thread.wait()
+        self.epoch += 1
+        self.latest.value = self.generation = self.generation + 1
+        if self.running:
+            self.running = 0
+            self.busy_changed.emit(False)
+        if message is not None:
+            self.error.emit(None, message)
+        self.abandoned.emit(None)
+        self.start_process()
+
+    def stop(self):
+        """Oprește procesul și firul de citire; apelurile repetate nu mai fac nimic."""
+        if self.stopping:
+            return
+        self.stopping = True
+        self.debounce.stop()
+        self.cancel_timer.stop()
+        self.latest.value = -1
+        try:
+            self.commands.send(('stop', None))
+        except OSError:
+            pass
+        # O operație OCC în curs nu poate fi întreruptă; după o așteptare, procesul e oprit forțat
+        self.process.join(5)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join()
+        self.thread.quit()
+        self.thread.wait()
@@ -0,0 +1,100 @@
+import argparse
+import json
+import sys
+
+from building_engine import build_building, write_volumes, write_brep, write_dxf
+from booleans import configure_booleans, boolean_report
+from columns import ColumnType, SECTIONS
+from disk_cache import DiskCache
+from profiling import StageTimer
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generează clădirea fără interfață grafică.")
+    parser.add_argument('--x', type=float, nargs='+', default=[0, 4, 7, 10], help="Coordonatele axelor X")
+    parser.add_argument('--y', type=float, nargs='+', default=[0, 5, 6.5, 10], help="Coordonatele axelor Y")
+    parser.add_argument('--no-interior-covering', action='store_true', help="Nu calcula finisajele interioare")
+    parser.add_argument('--no-exterior-covering', action='store_true', help="Nu calcula finisajul exterior")
+    parser.add_argument('--no-roof', action='store_true', help="Nu calcula acoperișul")
+    parser.add_argument('--blender-json', help="Mesh exportat din Blender (JSON)")
+    parser.add_argument('--volumes', help="Fișier JSON pentru volume (implicit: stdout)")
+    parser.add_argument('--dxf', help="Fișier DXF pentru coloane")
+    parser.add_argument('--brep-dir', help="Director pentru fișierele BREP (unul pe grup de elemente)")
+    parser.add_argument('--column-section', choices=SECTIONS, default='rectangular')
+    parser.add_argument('--column-width', type=float, default=0.25, help="Latura pe X sau diametrul stâlpului")
+    parser.add_argument('--column-depth', type=float, default=0.25, help="Latura pe Y a stâlpului")
+    parser.add_argument('--column-height', type=float, default=2.8)
+    parser.add_argument('--levels', type=int, default=1, help="Numărul de niveluri de stâlpi suprapuse")
+    parser.add_argument('--cache-dir', help="Cache persistent pentru pereți, fundații, acoperiș și mesh-uri importate")
+    parser.add_argument('--serial-booleans', action='store_true', help="Dezactivează modul paralel OCC")
+    parser.add_argument('--fuzzy', type=float, help="Toleranța fuzzy pentru toate operațiile booleene")
+    parser.add_argument('--boolean', action='append', default=[], metavar='SITE:KEY=VALUE',
+                        help="Setare pentru un singur site, ex. walls:glue=shift sau foundation:fuzzy=0")
+    parser.add_argument('--boolean-report', action='store_true', help="Afișează timpii operațiilor booleene pe site")
+    parser.add_argument('--timings', action='store_true', help="Afișează timpii pe etape și pe tip de element")
+    parser.add_argument('--trace', help="Fișier Chrome trace-event (JSON) cu toate etapele")
+    return parser.parse_args(argv)
+
+
+def parse_boolean_option(text):
+    site, _, assignment = text.partition(':')
+    key, _, value = assignment.partition('=')
+    if not site or not key or not value:
+        raise ValueError(f"Expected SITE:KEY=VALUE, got {text!r}")
+    if key == 'fuzzy':
+        value = float(value)
+    elif key in ('parallel', 'use_obb'):
+        value = value.lower() in ('1', 'true', 'yes', 'on')
+    return site, {key: value}
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.serial_booleans:
+        configure_booleans(parallel=False)
+    if args.fuzzy is not None:
+        configure_booleans(fuzzy=args.fuzzy)
+    for option in args.boolean:
+        site, values = parse_boolean_option(option)
+        configure_booleans(site, **values)
+
+    column_type = ColumnType(args.column_section, args.column_width, args.column_depth, args.column_height)
+    column_levels = [(level * args.column_height, column_type) for level in range(args.levels)]
+    timer = StageTimer()
+    result = build_building(
+        args.x, args.y,
+        show_interior_covering=not args.no_interior_covering,
+        show_exterior_covering=not args.no_exterior_covering,
+        show_roof=not args.no_roof,
+        blender_json=args.blender_json,
+        column_levels=column_levels,
+        disk_cache=DiskCache(args.cache_dir) if args.cache_dir else None,
+        timer=timer,
+    )
+
+    if args.volumes:
+        write_volumes(result.volumes, args.volumes)
+    else:
+        json.dump(result.volumes, sys.stdout, indent=2)
+        print()
+    if args.dxf:
+        with timer.stage('dxf'):
+            write_dxf(result, args.dxf)
+    if args.brep_dir:
+        with timer.stage('brep'):
+            paths = write_brep(result, args.brep_dir)
+        for path in paths:
+            print(path, file=sys.stderr)
+    if args.boolean_report:
+        json.dump(boolean_report(), sys.stderr, indent=2)
+        print(file=sys.stderr)
+    if args.timings:
+        json.dump(timer.summary(), sys.stderr, indent=2)
+        print(file=sys.stderr)
+    if args.trace:
+        timer.write_trace(args.trace)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,604 @@
+import json
+import os
+import numpy as np
+from OCC.Core.gp import gp_Pnt, gp_Vec
+from OCC.Core.BRepPrimAPI import BRepPrimAPI_MakePrism
+from OCC.Core.BRep import BRep_Builder
+from OCC.Core.BRepTools import breptools_Write
+from OCC.Core.TopoDS import TopoDS_Compound
+
+from fenestration import Fenestration, bounding_footprint
+from booleans import cut_many as _cut_many, BoxIndex, BOOLEAN_TIMINGS, reset_boolean_timings, settings_for
+from shape_cache import memoize, make_key
+from disk_cache import digest
+from geometry_utils import create_face, room_polygons, calc_volume, translate_face, place_shape, prism_volume
+from columns import DEFAULT_LEVELS
+from beams import create_beam_pairs, create_beam_contours, beam_points, beam_skips
+from map_builder import column_list, column_indices, skip_mask
+from roofs import roof_01
+from profiling import StageTimer
+from progress import OperationCancelled, using
+
+# Motorul de generare fără Qt: construiește formele clădirii și volumele,
+# fără să depindă de un qtViewer3d. BuildingGenerator doar le afișează.
+
+HEIGHT = 2.8
+FOUNDATION_DEPTH = -1.2
+FOUNDATION_THICKNESS = 0.45
+
+# Planul original 4 x 4: camere, stâlpi lipsă și grinzi proiectate de mână.
+# Orice altă rețea primește o cameră pe travee, toți stâlpii și toate grinzile.
+LEGACY_GRID = (4, 4)
+COLUMN_SKIP = [(2, 0), (2, 3)]
+BEAM_SKIP_X = [(2, 0), (2, 2), (1, 1)]
+BEAM_SKIP_Y = [(1, 0), (1, 3)]
+
+# Tabelul camerelor: indicii (i, j) ai celor patru colțuri, în ordinea din create_room_shape
+ROOM_TABLE = np.array([
+    [[0, 0], [0, 1], [1, 1], [1, 0]],
+    [[0, 1], [0, 2], [2, 2], [2, 1]],
+    [[0, 2], [0, 3], [1, 3], [1, 2]],
+    [[1, 0], [1, 1], [3, 1], [3, 0]],
+    [[2, 1], [2, 2], [3, 2], [3, 1]],
+    [[1, 2], [1, 3], [3, 3], [3, 2]],
+])
+# Straturile decalate spre interior: cameră, celulă de fundație, finisaj interior
+ROOM_LAYERS = [0.125, 0.3, 0.13]
+# Straturile conturului clădirii spre exterior: fundal, finisaj exterior, fundație, gazon
+FOOTPRINT_LAYERS = [0.125, 0.225, 0.3, 10.0]
+
+# Ordinea în care elementele sunt returnate (și afișate)
+ELEMENT_NAMES = [
+    'columns',
+    'slabs',
+    'foundation',
+    'elevation',
+    'window_frames',
+    'window_glass',
+    'window_wood',
+    'walls',
+    'beams',
+    'exterior_covering',
+    'interior_coverings',
+    'grass',
+    'roof',
+    'blender',
+]
+
+
+VOLUME_GROUPS = ['Foundation', 'Elevation', 'Beams', 'Columns', 'Walls']
+
+# Etapa de afișare a fiecărui tip de element; tipurile care lipsesc sunt propria etapă.
+# Ordinea etapelor e cea din plan_building: întâi cele ieftine, apoi pereții și finisajele.
+ELEMENT_STAGES = {
+    'room': 'slabs',
+    'slab': 'slabs',
+    'column': 'columns',
+    'beam-x': 'beams',
+    'beam-y': 'beams',
+    'window': 'fenestration',
+    'exterior_covering': 'coverings',
+    'interior_covering': 'coverings',
+    'elevation': 'foundation',
+    'foundation': 'foundation',
+}
+
+# Intră în cheile cache-ului de pe disc: orice schimbare a constantelor invalidează intrările
+ENGINE_KEY = ('building_engine', 1, HEIGHT, FOUNDATION_DEPTH, FOUNDATION_THICKNESS)
+
+
+class BuildCancelled(OperationCancelled):
+    """Construcția a fost abandonată pentru că o cerere mai nouă a înlocuit-o."""
+
+
+class Element:
+    """
+    Un nod din graful de dependențe al clădirii.
+
+    Args:
+        element_id (str): ID stabil, ex. "column[1,2]" sau "walls".
+        signature: Intrările numerice ale elementului; dacă nu se schimbă între
+            două regenerări (și nici elementele din `requires`), elementul e refolosit.
+        build (callable): Primește valorile elementelor din `requires` și întoarce
+            (valoare, [(grup, formă), ...]). Valoarea e folosită de elementele dependente.
+        requires (list of str): ID-urile elementelor de care depinde.
+        volume_group (str): Cheia din dicționarul de volume la care contribuie.
+        volume (callable): Volumul în formă închisă, când elementul e o extrudare
+            sau o cutie cunoscută; altfel se calculează cu GProp din valoarea construită.
+        cache_group (str): Pentru elementele scumpe cu o singură formă: grupul ei.
+            Astfel de elemente sunt păstrate și în cache-ul de pe disc (DiskCache).
+        site (str): Site-ul operației booleene din `build` (vezi booleans.SITE_SETTINGS);
+            setările lui intră în cheia elementului.
+    """
+
+    def __init__(self, element_id, signature, build, requires=(), volume_group=None, volume=None,
+                 cache_group=None, site=None):
+        self.element_id = element_id
+        self.signature = make_key(signature)
+        self.build = build
+        self.requires = list(requires)
+        self.volume_group = volume_group
+        self.volume_fn = volume
+        self.cache_group = cache_group
+        self.site = site
+        self.digest = None
+        self.value = None
+        self.shapes = []
+        self.volume = 0.0
+
+    def run(self, elements, disk_cache=None, timer=None, mesh=None):
+        """
+        Args:
+            mesh (tuple): (deflecție, unghi) pentru triangularea formei scrise în
+                DiskCache; implicit deflecția finală a afișării.
+        """
+        timer = timer or StageTimer()
+        if self.cache_group and disk_cache is not None:
+            with timer.stage('disk_cache.get', 'disk_cache') as event:
+                cached = disk_cache.get(self.digest)
+                event['hit'] = cached is not None
+            if cached is not None:
+                self.value, entry = cached
+                self.shapes = [(self.cache_group, self.value)]
+                self.volume = entry.get('volume', 0.0)
+                return
+
+        self.value, self.shapes = self.build(*[elements[r].value for r in self.requires])
+        if self.volume_group:
+            with timer.stage('volume', analytic=self.volume_fn is not None):
+                self.volume = self.volume_fn() if self.volume_fn else calc_volume(self.value)
+        if self.cache_group and disk_cache is not None:
+            with timer.stage('disk_cache.put', 'disk_cache'):
+                disk_cache.put(self.digest, self.value, *(mesh or ()), volume=self.volume)
+
+
+class BuildingResult:
+    """Result of a headless build: elements, named shapes and volumes."""
+
+    def __init__(self, intersection_matrix, column_points, elements, changed=(), removed=()):
+        self.intersection_matrix = intersection_matrix
+        self.column_points = column_points
+        self.elements = elements
+        self.changed = list(changed)
+        self.removed = list(removed)
+        self.shapes = {name: [] for name in ELEMENT_NAMES}
+        for element in elements.values():
+            for name, shape in element.shapes:
+                self.shapes[name].append(shape)
+        self.volumes = {name: 0.0 for name in VOLUME_GROUPS}
+        for element in elements.values():
+            if element.volume_group:
+                self.volumes[element.volume_group] += element.volume
+
+    def iter_shapes(self):
+        """Yield (name, shape) pairs in display order."""
+        for name in ELEMENT_NAMES:
+            for shape in self.shapes[name]:
+                yield name, shape
+
+
+class BuildingModel:
+    """
+    Păstrează elementele ultimei construcții și, la o regenerare, reconstruiește
+    doar elementele ale căror intrări (sau dependențe) s-au schimbat.
+    """
+
+    def __init__(self, disk_cache=None):
+        self.elements = {}
+        self.disk_cache = disk_cache
+
+    def update(self, x_interax, y_interax, timer=None, cancel=None, on_stage=None, progress=None, mesh=None,
+               **options):
+        """
+        Args:
+            timer (StageTimer): Primește câte o etapă pentru plan și pentru fiecare
+                element reconstruit, cu numărul de operații booleene în `booleans`.
+            cancel (callable): Verificat înainte de fiecare element; dacă întoarce
+                True, se ridică BuildCancelled, iar modelul rămâne cel de dinainte.
+            on_stage (callable): on_stage(etapă, elemente) e apelat la sfârșitul
+                fiecărei etape (ELEMENT_STAGES) cu elementele reconstruite în ea,
+                ca formele să poată fi afișate înainte de terminarea construcției.
+            progress (ProgressRange): Împărțit egal între elementele planului; fiecare
+                element reconstruit își rulează operațiile booleene și triangulările în
+                subintervalul lui, iar anularea e verificată în jurul fiecăreia
+                (OperationCancelled). Modelul rămâne cel de dinainte la anulare.
+            mesh (tuple): (deflecție, unghi) cu care elementele scrise în DiskCache sunt
+                triangulate; în timpul editării e nivelul grosier, ca triangularea
+                fină să nu se facă înaintea celei grosiere.
+        """
+        timer = timer or StageTimer()
+        # Timpii booleeni descriu doar construcția curentă (GUI-ul și sweep-ul rulează la nesfârșit)
+        reset_boolean_timings()
+        with timer.stage('plan'):
+            intersection_matrix, column_points, plan = plan_building(x_interax, y_interax, **options)
+        steps = progress.split(len(plan)) if progress is not None else [None] * len(plan)
+        elements = {}
+        changed = []
+        dirty = set()
+        stage, stage_elements = None, []
+        for element, step in zip(plan, steps):
+            # Cheia de conținut: tipul elementului, intrările lui, setările booleene și cheile dependențelor
+            kind = element.element_id.split('[')[0]
+            if ELEMENT_STAGES.get(kind, kind) != stage:
+                if on_stage is not None and stage_elements:
+                    on_stage(stage, stage_elements)
+                stage, stage_elements = ELEMENT_STAGES.get(kind, kind), []
+            settings = make_key(settings_for(element.site).key()) if element.site else None
+            element.digest = digest(ENGINE_KEY, kind, element.signature, settings,
+                                    [elements[r].digest for r in element.requires])
+            previous = self.elements.get(element.element_id)
+            if (previous is None or previous.digest != element.digest
+                    or previous.requires != element.requires
+                    or any(r in dirty for r in element.requires)):
+                if cancel is not None and cancel():
+                    raise BuildCancelled(element.element_id)
+                booleans = len(BOOLEAN_TIMINGS)
+                with timer.stage(element.element_id, kind) as event, using(step):
+                    element.run(elements, self.disk_cache, timer, mesh)
+                    event['booleans'] = len(BOOLEAN_TIMINGS) - booleans
+                if step is not None:
+                    step.done(element.element_id)
+                dirty.add(element.element_id)
+                changed.append(element.element_id)
+                stage_elements.append(element)
+            else:
+                element = previous
+            elements[element.element_id] = element
+        if on_stage is not None and stage_elements:
+            on_stage(stage, stage_elements)
+        removed = [element_id for element_id in self.elements if element_id not in elements]
+        self.elements = elements
+        return BuildingResult(intersection_matrix, column_points, elements, changed, removed)
+
+def window_placement(intersection_matrix, i, j, angle, offset, z_height=0):
+    if angle not in [0, 90, 180, 270]:
+        raise ValueError("Angle must be 0, 90, 180, or 270.")
+
+    base_point = intersection_matrix[i, j]
+    x, y = base_point[0], base_point[1]
+
+    if angle == 0:
+        x += offset
+    elif angle == 90:
+        y += offset
+    elif angle == 180:
+        x -= offset
+    elif angle == 270:
+        y -= offset
+
+    return gp_Pnt(x, y, z_height), angle
+
+
+def default_fenestration_params(intersection_matrix):
+    m = intersection_matrix
+    return [
+        (*window_placement(m, 0, 1, 0, 0.5, 0.), 0.9, 2.1, 0.05, "double"),
+        (*window_placement(m, 0, 1, 90, 0.5, 0.), 0.9, 2.1, 0.05, "double"),
+        (*window_placement(m, 0, 2, 90, 0.5, 0.), 0.9, 2.1, 0.05, "double"),
+        (*window_placement(m, 1, 1, 90, 0.25, 0.), 0.9, 2.1, 0.05, "double"),
+        (*window_placement(m, 0, 2, 90, 0.5, 0.), 0.9, 2.1, 0.05, "double"),
+        (*window_placement(m, 1, 2, 90, 0.25, 0.), 0.9, 2.1, 0.05, "double"),
+        (*window_placement(m, 2, 1, 0, 0.5, 0.), 0.9, 2.1, 0.05, "double"),
+        (*window_placement(m, 0, 0, 0, 1.2, 0.9), 1.5, 1.2, 0.05, "single"),
+        (*window_placement(m, 0, 2, 0, 1.2, 0.9), 1.5, 1.2, 0.05, "single"),
+        (*window_placement(m, 1, 0, 90, 1.8, 0.9), 1.2, 1.2, 0.05, "single"),
+        (*window_placement(m, 1, 3, 90, 1.8, 0.9), 1.2, 1.2, 0.05, "single"),
+        (*window_placement(m, 3, 1, 0, 0.5, 1.2), 0.6, 0.9, 0.05, "single")
+    ]
+
+
+def perimeter_fenestration_params(intersection_matrix, width=1.2, height=1.2, sill=0.9):
+    """O fereastră centrată pe fiecare travee a conturului, dacă încape între stâlpi."""
+    m = intersection_matrix
+    rows, cols = m.shape[:2]
+    params = []
+    for i in sorted({0, rows - 1}):
+        for j in range(cols - 1):
+            span = m[i, j + 1, 0] - m[i, j, 0]
+            if span >= width + 0.25:
+                params.append((*window_placement(m, i, j, 0, (span - width) / 2, sill), width, height, 0.05, "single"))
+    for j in sorted({0, cols - 1}):
+        for i in range(rows - 1):
+            span = m[i + 1, j, 1] - m[i, j, 1]
+            if span >= width + 0.25:
+                params.append((*window_placement(m, i, j, 90, (span - width) / 2, sill), width, height, 0.05, "single"))
+    return params
+
+
+def bay_room_table(rows, cols):
+    """O cameră pe fiecare travee, în ordinea rândurilor: ((rows-1)*(cols-1), 4, 2)."""
+    i, j = (a.ravel() for a in np.mgrid[0:rows - 1, 0:cols - 1])
+    return np.stack([
+        np.stack([i, j], axis=-1),
+        np.stack([i, j + 1], axis=-1),
+        np.stack([i + 1, j + 1], axis=-1),
+        np.stack([i + 1, j], axis=-1),
+    ], axis=1)
+
+
+def footprint_table(rows, cols):
+    """Conturul clădirii: colțurile exterioare ale rețelei."""
+    return np.array([[[0, 0], [0, cols - 1], [rows - 1, cols - 1], [rows - 1, 0]]])
+
+
+def build_fenestration(params):
+    return Fenestration.from_template(*params)
+
+
+# Tăierile pe forme deja cache-uite se repetă identic, deci sunt și ele memorate
+_memoized_cut_many = memoize('cut_many')(_cut_many)
+
+
+def cut_many(shape, tools, site='default'):
+    # Setările efective intră în cheie: după configure_booleans, tăierile vechi nu sunt refolosite
+    return _memoized_cut_many(shape, tools, site=site, settings=settings_for(site))
+
+
+@memoize('box_index')
+def box_index(shapes):
+    return BoxIndex(shapes)
+
+
+def windows_by_room(rooms, fenestration_params, tolerance=0.01):
+    """
+    Matricea (camere, ferestre): True dacă cutia de încadrare a ferestrei atinge
+    camera în plan. Se compară dreptunghiurile de încadrare, deci rezultatul poate
+    doar supraestima; overlapping() alege exact uneltele la construcție.
+    """
+    rooms = np.asarray(rooms)
+    if not fenestration_params:
+        return np.zeros((len(rooms), 0), dtype=bool)
+    footprints = np.array([bounding_footprint(point, angle, width, depth)
+                           for point, angle, width, _, depth, *_ in fenestration_params])
+    room_min, room_max = rooms.min(axis=1), rooms.max(axis=1)
+    box_min, box_max = footprints.min(axis=1) - tolerance, footprints.max(axis=1) + tolerance
+    return np.all((box_min[None] <= room_max[:, None]) & (box_max[None] >= room_min[:, None]), axis=-1)
+
+
+def overlapping(target, tools):
+    """Doar uneltele a căror cutie de încadrare atinge ținta; restul nu pot tăia nimic."""
+    if not tools:
+        return []
+    return box_index(tuple(tools)).query(target)
+
+
+@memoize('prism')
+def prism(points, height, z=0.0):
+    face = create_face(points)
+    if z:
+        face = translate_face(face, z)
+    return BRepPrimAPI_MakePrism(face, gp_Vec(0, 0, height)).Shape()
+
+
+def plan_building(x_interax, y_interax, show_interior_covering=True, show_exterior_covering=True,
+                  show_roof=True, blender_json=None, column_levels=None, fenestration_params=None,
+                  column_skip=None):
+    """
+    Descrie clădirea ca listă de elemente în ordinea dependențelor, fără să construiască nimic.
+
+    Rețeaua poate avea oricâte axe pe fiecare direcție. Pentru rețeaua 4 x 4 se
+    folosesc tabelele originale (ROOM_TABLE, COLUMN_SKIP, ferestrele implicite);
+    altfel fiecare travee e o cameră și fiecare travee de pe contur are o fereastră.
+
+    fenestration_params înlocuiește lista implicită de ferestre.
+    column_skip (mască booleană sau listă de indici) înlocuiește stâlpii lipsă impliciți;
+    grinzile pe X sunt deduse din ea cu beams.beam_skips, iar cele pe Y trec peste nodurile lipsă.
+
+    Returns:
+        tuple: (intersection_matrix, column_points, list of Element)
+    """
+    for name, axes in (('x', x_interax), ('y', y_interax)):
+        if len(axes) < 2 or np.any(np.diff(axes) <= 0):
+            raise ValueError(f"Need at least two strictly increasing {name} axes, got {list(axes)}")
+    X, Y = np.meshgrid(x_interax, y_interax)
+    intersection_matrix = np.dstack((X, Y))
+    m = intersection_matrix
+    rows, cols = m.shape[:2]
+    legacy = (rows, cols) == LEGACY_GRID
+    plan = []
+
+    # Rooms, foundation cells and interior coverings: (rooms, layers, 4, 2) in one broadcast
+    room_table = ROOM_TABLE if legacy else bay_room_table(rows, cols)
+    room_layers = room_polygons(m, room_table, ROOM_LAYERS)
+    rooms, foundation_cells, int_coverings = (room_layers[:, k] for k in range(len(ROOM_LAYERS)))
+    background, out_covering, foundation_outline, grass = \
+        room_polygons(m, footprint_table(rows, cols), -np.asarray(FOOTPRINT_LAYERS))[0]
+
+    room_ids = []
+    for r, room in enumerate(rooms):
+        room_ids.append(f"room[{r}]")
+        plan.append(Element(f"room[{r}]", room, lambda room=room: (prism(room, HEIGHT), [])))
+        plan.append(Element(f"slab[{r}]", room,
+                            lambda room=room: single('slabs', prism(room, 0.1))))
+
+    # Columns: one prototype per column type, placed on every grid node of every level
+    if column_skip is None and legacy:
+        column_skip = skip_mask(m.shape[:2], COLUMN_SKIP)
+        skipx, skipy = BEAM_SKIP_X, BEAM_SKIP_Y
+    else:
+        column_skip = skip_mask(m.shape[:2], column_skip)
+        skipx, skipy = beam_skips(column_skip), None
+    column_points = column_list(m, column_skip)
+    column_ids = []
+    for level, (z, column_type) in enumerate(column_levels or DEFAULT_LEVELS):
+        for (i, j), point in zip(column_indices(m, column_skip).tolist(), column_points):
+            element_id = f"column[{i},{j}]" if level == 0 else f"column[{i},{j}]@{level}"
+            column_ids.append(element_id)
+            plan.append(Element(element_id, (point, z, column_type),
+                                lambda point=point, z=z, column_type=column_type:
+                                    single('columns', column_type.place(point, z)),
+                                volume_group='Columns', volume=column_type.volume))
+
+    # Beams
+    beam_matrix = beam_points(m, 0.25)
+    x_beams, y_beams = create_beam_pairs(beam_matrix, skipx, skipy, column_skip)
+    contours = create_beam_contours(np.concatenate([x_beams, y_beams]))
+    beam_ids = []
+    for axis, axis_contours in [('x', contours[:len(x_beams)]), ('y', contours[len(x_beams):])]:
+        for k, contour in enumerate(axis_contours):
+            beam_ids.append(f"beam-{axis}[{k}]")
+            plan.append(Element(f"beam-{axis}[{k}]", contour,
+                                lambda contour=contour: single('beams', beam_instance(contour)),
+                                volume_group='Beams',
+                                volume=lambda contour=contour: prism_volume(contour, 0.25)))
+
+    # Fenestration: the value of a window element is its placed bounding box
+    window_ids = []
+    if fenestration_params is None:
+        fenestration_params = default_fenestration_params(m) if legacy else perimeter_fenestration_params(m)
+    for k, params in enumerate(fenestration_params):
+        window_ids.append(f"window[{k}]")
+        plan.append(Element(f"window[{k}]", params, lambda params=params: build_window(params)))
+
+    # Walls: rooms, columns, window openings and beams removed in a single boolean
+    def build_walls(*tools):
+        walls = cut_many(prism(background, HEIGHT), list(tools), site='walls')
+        return single('walls', walls)
+    plan.append(Element('walls', background, build_walls,
+                        requires=room_ids + column_ids + window_ids + beam_ids, volume_group='Walls',
+                        cache_group='walls', site='walls'))
+
+    if show_exterior_covering:
+        def build_exterior(*bounding_boxes):
+            out_covering_prism = prism(out_covering, HEIGHT)
+            tools = [prism(background, HEIGHT)] + overlapping(out_covering_prism, bounding_boxes)
+            return single('exterior_covering', cut_many(out_covering_prism, tools,
+                                                        site='exterior_covering'))
+        plan.append(Element('exterior_covering', (out_covering, background), build_exterior,
+                            requires=window_ids, cache_group='exterior_covering', site='exterior_covering'))
+
+    if show_interior_covering:
+        # Fiecare finisaj depinde doar de ferestrele care îi ating camera: mutarea
+        # unei ferestre reface pereții, dar nu și finisajele camerelor îndepărtate
+        room_windows = windows_by_room(rooms, fenestration_params)
+        for r, int_covering in enumerate(int_coverings):
+            def build_interior(room_prism, *bounding_boxes, int_covering=int_covering):
+                tools = [prism(int_covering, HEIGHT)] + overlapping(room_prism, bounding_boxes)
+                return single('interior_coverings', cut_many(room_prism, tools, site='interior_coverings'))
+            plan.append(Element(f"interior_covering[{r}]", int_covering, build_interior,
+                                requires=[f"room[{r}]"] + [window_ids[k] for k in np.flatnonzero(room_windows[r])],
+                            cache_group='interior_coverings', site='interior_coverings'))
+
+    # Foundation elevations: background prism below ground minus the rooms
+    def build_elevation():
+        tools = [prism(room, FOUNDATION_DEPTH) for room in rooms]
+        return single('elevation', cut_many(prism(background, FOUNDATION_DEPTH), tools, site='elevation'))
+    plan.append(Element('elevation', (background, rooms), build_elevation, volume_group='Elevation',
+                        volume=lambda: prism_volume(background, FOUNDATION_DEPTH, rooms),
+                        cache_group='elevation', site='elevation'))
+
+    # Exterior foundation contour minus the foundation cells
+    def build_foundation():
+        tools = [prism(cell, FOUNDATION_THICKNESS, -1.65) for cell in foundation_cells]
+        foundation = cut_many(prism(foundation_outline, FOUNDATION_THICKNESS, -1.65), tools, site='foundation')
+        return single('foundation', foundation)
+    plan.append(Element('foundation', (foundation_outline, foundation_cells), build_foundation,
+                        volume_group='Foundation',
+                        volume=lambda: prism_volume(foundation_outline, FOUNDATION_THICKNESS, foundation_cells),
+                        cache_group='foundation', site='foundation'))
+
+    plan.append(Element('grass', grass, lambda: single('grass', prism(grass, 0.1, -0.45))))
+
+    if show_roof:
+        point_01 = m[-1, -1]
+        point_max = [point_01[0] + 1.8, point_01[1] + 1.8]
+        insert_01 = m[0, 0]
+        insertion_point_r = [insert_01[0] - 0.9, insert_01[1] - 0.9, HEIGHT]
+        plan.append(Element('roof', (point_max, insertion_point_r),
+                            lambda: single('roof', roof_01(point_max, insertion_point_r, HEIGHT, 2, 0.3)),
+                            cache_group='roof'))
+
+    if blender_json:
+        def build_blender():
+            from BlenderImportJson import read_json, build_faces_from_json
+            return single('blender', build_faces_from_json(read_json(blender_json)))
+        plan.append(Element('blender', (blender_json, os.path.getmtime(blender_json)), build_blender,
+                            cache_group='blender'))
+
+    return intersection_matrix, column_points, plan
+
+
+def beam_instance(contour):
+    # Grinzile cu aceeași secțiune și lungime au același contur local, deci același prototip
+    origin = contour[0]
+    local_contour = contour - np.array([origin[0], origin[1], 0.0])
+    return place_shape(prism(local_contour, 0.25, 2.55), origin[0], origin[1])
+
+
+def single(name, shape):
+    return shape, [(name, shape)]
+
+
+def build_window(params):
+    fenestration = build_fenestration(params)
+    shapes = fenestration.get_transformed_shapes()
+    named = [('window_frames', shapes['window'])]
+    named += [('window_glass', glass) for glass in shapes['glass']]
+    named += [('window_wood', wood) for wood in shapes['wood']]
+    return fenestration.apply_transformation(fenestration.bounding_box), named
+
+
+def build_building(x_interax, y_interax, show_interior_covering=True, show_exterior_covering=True,
+                   show_roof=True, blender_json=None, column_levels=None, disk_cache=None, timer=None,
+                   fenestration_params=None, column_skip=None):
+    """
+    Construiește geometria clădirii fără afișare.
+
+    Args:
+        x_interax (list of float): Coordonatele axelor pe X.
+        y_interax (list of float): Coordonatele axelor pe Y.
+        show_interior_covering (bool): Calculează finisajele interioare.
+        show_exterior_covering (bool): Calculează finisajul exterior.
+        show_roof (bool): Calculează acoperișul.
+        blender_json (str): Calea opțională către un mesh exportat din Blender.
+        column_levels (list): Perechi (cota de bază, ColumnType); implicit columns.DEFAULT_LEVELS.
+        disk_cache (DiskCache): Cache persistent pentru elementele scumpe (opțional).
+        timer (StageTimer): Cronometrează etapele și elementele (opțional).
+        fenestration_params (list): Parametrii ferestrelor; implicit cei ai rețelei (vezi plan_building).
+        column_skip: Mască booleană sau listă de noduri fără stâlp; implicit COLUMN_SKIP pe 4 x 4.
+
+    Returns:
+        BuildingResult: Elementele, formele denumite și dicționarul de volume.
+    """
+    return BuildingModel(disk_cache).update(
+        x_interax, y_interax,
+        timer=timer,
+        show_interior_covering=show_interior_covering,
+        show_exterior_covering=show_exterior_covering,
+        show_roof=show_roof,
+        blender_json=blender_json,
+        column_levels=column_levels,
+        fenestration_params=fenestration_params,
+        column_skip=column_skip,
+    )
+
+def write_volumes(volumes, filename):
+    with open(filename, 'w') as json_file:
+        json.dump(volumes, json_file)
+
+
+def make_compound(shapes):
+    compound = TopoDS_Compound()
+    builder = BRep_Builder()
+    builder.MakeCompound(compound)
+    for shape in shapes:
+        builder.Add(compound, shape)
+    return compound
+
+
+def write_brep(result, directory):
+    """Write one BREP file per non-empty element group and return the paths."""
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for name in ELEMENT_NAMES:
+        if not result.shapes[name]:
+            continue
+        path = os.path.join(directory, f"{name}.brep")
+        breptools_Write(make_compound(result.shapes[name]), path)
+        paths.append(path)
+    return paths
+
+
+def write_dxf(result, filename, append=False):
+    from dxf import columns_dxf_batch
+    columns_dxf_batch(result.column_points, filename, append=append)
@@ -1,6 +1,8 @@
 import numpy as np
 from PyQt5.QtWidgets import  QMainWindow, QTabWidget, QVBoxLayout, QHBoxLayout, QWidget, QLabel, QSlider, QCheckBox, QPushButton, QLabel, QLineEdit, QScrollArea
-from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QProgressBar
+from PyQt5.QtCore import Qt, QTimer, QEvent
+from PyQt5.QtWidgets import QApplication
 from OCC.Display.backend import load_backend
 load_backend("pyqt5")
 from OCC.Display.qtDisplay import qtViewer3d
@@ -22,18 +24,46 @@ from OCC.Core.Quantity import (
 )
 
 import json
+import os
 import matplotlib.pyplot as plt
 
-from fenestration import Fenestration
-from geometry_utils import showColorDialog, footprint_rectangle, create_face, toggle_clip_plane, create_room_shape, calc_volume, create_column, translate_face, create_grid, create_axis_grid
+from geometry_utils import showColorDialog, toggle_clip_plane, create_grid, create_axis_grid
 from visualization import read_volumes_from_json, create_matplotlib_charts
-from beams import create_beam_pairs, create_beam_contours, beam_points, drop_list_at_indexes
-from map_builder import create_column_points, column_list
-from roofs import roof_01
 from ClipPlane import create_clip_plane
-import ezdxf
-from dxf import columns_dxf
-from BlenderImportJson import read_json, build_faces_from_json
+from building_engine import window_placement
+from instancing import InstancedDisplay, ElementRegistry
+from build_process import BuildRequest, RefineRequest, write_outputs
+from build_worker import LiveBuilder
+from meshing import configure_drawer, MESH_DEFLECTION, COARSE_DEFLECTION, COARSE_ANGLE, DEFAULT_ANGLE
+
+BLENDER_JSON_PATH = "C:\\Users\\ciunt\\OneDrive\\Desktop\\exports\\mesh_export.json"
+# Dacă e setată, fiecare regenerare scrie aici un Chrome trace (chrome://tracing)
+TRACE_PATH = os.environ.get('HOUSEMAKER_TRACE')
+# Cadența redesenării în timpul afișării (secunde); None = o singură redesenare la final
+DISPLAY_FRAME_INTERVAL = None
+# Nivel de detaliu: în timpul interacțiunii se triangulează grosier, iar după
+# LOD_IDLE_MS fără editări sau mișcări de cameră totul e retriangulat fin
+LOD_IDLE_MS = 800
+# Pauza după ultima editare înainte ca regenerarea să pornească
+LIVE_DEBOUNCE_MS = 300
+
+# Culoarea (RGB) și transparența fiecărui grup de elemente din BuildingResult
+ELEMENT_STYLES = {
+    'columns': ((0.3, 0.3, 0.2), 0.0),
+    'slabs': ((0.8, 0.8, 0.8), 0.0),
+    'foundation': ((0.1, 0.1, 0.1), 0.0),
+    'elevation': ((0.1, 0.1, 0.1), 0.0),
+    'window_frames': ((0.5, 0.5, 0.5), 0.0),
+    'window_glass': ((0.0, 0.0, 1.0), 0.5),
+    'window_wood': ((0.33, 0.22, 0.14), 0.0),
+    'walls': ((0.796, 0.255, 0.329), 0.0),
+    'beams': ((0.3, 0.3, 0.3), 0.0),
+    'exterior_covering': ((1, 1, 0.5), 0.0),
+    'interior_coverings': ((0.9, 0.9, 0.9), 0.0),
+    'grass': ((0, 1, 0), 0.0),
+    'roof': ((0.647, 0.165, 0.165), 0.0),
+    'blender': (None, 0.5),
+}
 
 class BuildingGenerator(QMainWindow):
     def __init__(self):
@@ -47,6 +77,32 @@ class BuildingGenerator(QMainWindow):
         # Initialize lists for displayed shapes
         self.displayed_shapes = []
         self.ais_shapes = []
+
+        # Modelul păstrează elementele între regenerări, în procesul de construcție;
+        # registrul (creat în initUI) ține obiectele AIS ale fiecărui element și le actualizează pe loc
+        self.registry = None
+        # ID element -> digest-ul versiunii afișate acum
+        self.shown = {}
+        # Elementele ultimei construcții terminate (ID -> element), la care revine afișarea după o anulare
+        self.built = {}
+        self.live = LiveBuilder(debounce_ms=LIVE_DEBOUNCE_MS, after_build=write_outputs, parent=self)
+        self.live.ready.connect(self.on_build_ready)
+        self.live.staged.connect(self.on_build_staged)
+        self.live.error.connect(self.on_build_error)
+        self.live.abandoned.connect(self.on_build_abandoned)
+        self.live.busy_changed.connect(self.on_build_busy)
+        self.live.progressed.connect(self.on_build_progress)
+        self.live.refined.connect(self.on_refined)
+        self.axis_ais = []
+        self.displayed_axes = None
+
+        # Deflecția setată acum pe context și starea de interacțiune (vezi refine_meshes)
+        self.drawer_deflection = MESH_DEFLECTION
+        self.interacting = False
+        self.refine_timer = QTimer(self)
+        self.refine_timer.setSingleShot(True)
+        self.refine_timer.setInterval(LOD_IDLE_MS)
+        self.refine_timer.timeout.connect(self.refine_meshes)
         
         # Initialize the display first
         self.canvas = qtViewer3d(self)
@@ -88,6 +144,25 @@ class BuildingGenerator(QMainWindow):
         # Setare culoare fundal la alb
         self.canvas._display.View.SetBackgroundColor(Quantity_Color(0.828, 0.828, 0.828, Quantity_TOC_RGB))
         main_layout.addWidget(self.canvas, 4)
+
+        # Stâlpii, grinzile și ferestrele identice se afișează ca instanțe ale unui prototip
+        self.instanced = InstancedDisplay(self.canvas._display.Context)
+        self.registry = ElementRegistry(self.instanced)
+        configure_drawer(self.canvas._display.Context, MESH_DEFLECTION)
+        # Rotirea / zoom-ul amână retriangularea fină până la oprirea camerei
+        self.canvas.installEventFilter(self)
+
+        # Progresul construcției și anularea ei, în bara de stare (vizibile doar în timpul construcției)
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 1000)
+        self.progress_bar.setMaximumWidth(200)
+        self.progress_bar.setTextVisible(False)
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.clicked.connect(self.cancel_build)
+        self.statusBar().addPermanentWidget(self.progress_bar)
+        self.statusBar().addPermanentWidget(self.cancel_button)
+        self.progress_bar.hide()
+        self.cancel_button.hide()
         
         # Side panel
         side_panel = QWidget()
@@ -101,27 +176,25 @@ class BuildingGenerator(QMainWindow):
         scroll.setFixedWidth(220)
         main_layout.addWidget(scroll, 1)
         
-        # X interax inputs
+        # X / Y interax inputs: oricâte axe, adăugate sau șterse de la capăt
         self.x_inputs = []
-        side_layout.addWidget(QLabel('X Interax:'))
-        for i, val in enumerate([0, 4, 7, 10]):
-            layout = QHBoxLayout()
-            layout.addWidget(QLabel(f'X{i}:'))
-            line_edit = QLineEdit(str(val))
-            self.x_inputs.append(line_edit)
-            layout.addWidget(line_edit)
-            side_layout.addLayout(layout)
-        
-        # Y interax inputs
         self.y_inputs = []
-        side_layout.addWidget(QLabel('Y Interax:'))
-        for i, val in enumerate([0, 5, 6.5, 10]):
-            layout = QHBoxLayout()
-            layout.addWidget(QLabel(f'Y{i}:'))
-            line_edit = QLineEdit(str(val))
-            self.y_inputs.append(line_edit)
-            layout.addWidget(line_edit)
-            side_layout.addLayout(layout)
+        self.axis_layouts = {}
+        for direction, values in (('X', [0, 4, 7, 10]), ('Y', [0, 5, 6.5, 10])):
+            side_layout.addWidget(QLabel(f'{direction} Interax:'))
+            self.axis_layouts[direction] = QVBoxLayout()
+            side_layout.addLayout(self.axis_layouts[direction])
+            for val in values:
+                self.add_axis_input(direction, val)
+
+            buttons_layout = QHBoxLayout()
+            add_button = QPushButton(f'+ {direction}')
+            add_button.clicked.connect(lambda _, d=direction: self.add_axis_input(d))
+            buttons_layout.addWidget(add_button)
+            remove_button = QPushButton(f'- {direction}')
+            remove_button.clicked.connect(lambda _, d=direction: self.remove_axis_input(d))
+            buttons_layout.addWidget(remove_button)
+            side_layout.addLayout(buttons_layout)
         
                 # Checkboxes for coverings
         self.interior_checkbox = QCheckBox('Show Interior Covering')
@@ -140,6 +213,10 @@ class BuildingGenerator(QMainWindow):
         self.blender_checkbox.setChecked(False)
         side_layout.addWidget(self.blender_checkbox)
 
+        for checkbox in (self.interior_checkbox, self.exterior_checkbox, self.roof_checkbox, self.blender_checkbox):
+            checkbox.toggled.connect(self.begin_interaction)
+            checkbox.toggled.connect(self.schedule_update)
+
         # Update button
         update_button = QPushButton('Update Geometry')
         update_button.clicked.connect(self.update_geometry)
@@ -208,6 +285,92 @@ class BuildingGenerator(QMainWindow):
         #Add selection mode for manipulator
         #self.canvas._display.Context.Activate(AIS_Shape, True)
     
+    def axis_inputs(self, direction):
+        return self.x_inputs if direction == 'X' else self.y_inputs
+
+    def add_axis_input(self, direction, value=None):
+        """Adaugă o axă la capăt; implicit la aceeași distanță ca ultima deschidere."""
+        inputs = self.axis_inputs(direction)
+        user_added = value is None
+        if value is None:
+            try:
+                values = [float(line_edit.text()) for line_edit in inputs[-2:]]
+            except ValueError:
+                self.statusBar().showMessage("Interax values must be numbers")
+                return
+            step = values[-1] - values[-2] if len(values) == 2 else 4.0
+            value = values[-1] + step if values else 0.0
+
+        row = QWidget()
+        layout = QHBoxLayout(row)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(QLabel(f'{direction}{len(inputs)}:'))
+        line_edit = QLineEdit(f"{value:g}")
+        line_edit.textEdited.connect(self.begin_interaction)
+        line_edit.textEdited.connect(self.schedule_update)
+        layout.addWidget(line_edit)
+        self.axis_layouts[direction].addWidget(row)
+        inputs.append(line_edit)
+        if user_added:
+            self.schedule_update()
+
+    def remove_axis_input(self, direction):
+        """Șterge ultima axă; rămân cel puțin două pe fiecare direcție."""
+        inputs = self.axis_inputs(direction)
+        if len(inputs) > 2:
+            inputs.pop().parentWidget().deleteLater()
+            self.schedule_update()
+
+    def begin_interaction(self, *args):
+        """Editare sau mișcare de cameră: triangulare grosieră până la următoarea pauză."""
+        self.interacting = True
+        self.refine_timer.start()
+
+    def eventFilter(self, obj, event):
+        if obj is self.canvas and (event.type() == QEvent.Wheel or (
+                event.type() == QEvent.MouseMove and event.buttons() != Qt.NoButton)):
+            self.begin_interaction()
+        return super().eventFilter(obj, event)
+
+    def display_deflection(self):
+        return max(COARSE_DEFLECTION, MESH_DEFLECTION) if self.interacting else MESH_DEFLECTION
+
+    def set_drawer_deflection(self, deflection):
+        if deflection != self.drawer_deflection:
+            angle = COARSE_ANGLE if deflection > MESH_DEFLECTION else DEFAULT_ANGLE
+            configure_drawer(self.canvas._display.Context, deflection, angle)
+            self.drawer_deflection = deflection
+
+    def refine_meshes(self):
+        """După o pauză: cere procesului de construcție retriangularea fină a tot ce a fost afișat grosier."""
+        # O construcție în curs ar face retriangularea învechită; se reîncearcă după ea
+        if QApplication.mouseButtons() != Qt.NoButton or self.live.is_busy():
+            self.refine_timer.start()
+            return
+        self.interacting = False
+        if self.drawer_deflection <= MESH_DEFLECTION:
+            return
+        self.live.refine(RefineRequest(MESH_DEFLECTION, DEFAULT_ANGLE))
+
+    def on_refined(self, request, elements, timer):
+        """
+        Formele retriangulate fin sosesc ca prototipuri noi: obiectele AIS sunt
+        actualizate pe loc, iar prototipurile grosiere sunt eliberate (InstancedDisplay).
+        """
+        if self.interacting:
+            # O editare nouă a pornit între timp; următoarea pauză cere din nou retriangularea
+            return
+        with timer.stage('ui'):
+            self.set_drawer_deflection(request.deflection)
+            with self.instanced.batch():
+                for element_id in elements:
+                    self.shown.pop(element_id, None)
+                self.display_elements(
+                    (element_id, element.digest, element.shapes) for element_id, element in elements.items())
+        self.statusBar().showMessage(f"Refined meshes: {timer.status_text()}")
+        if TRACE_PATH:
+            timer.write_trace(TRACE_PATH)
+
     def activate_manipulator(self):
         """Function to activate/deactivate the manipulator"""
         if self.activate_manip_button.isChecked():
@@ -264,6 +427,15 @@ class BuildingGenerator(QMainWindow):
         self.canvas._display.EraseAll(True)
         self.displayed_shapes.clear()
         self.ais_shapes.clear()
+
+        # După EraseAll, următoarea regenerare trebuie să reafișeze toate elementele
+        self.registry.clear()
+        self.shown.clear()
+        self.built = {}
+        self.instanced.clear()
+        self.axis_ais = []
+        self.displayed_axes = None
+        self.live.reset_model()
         self.canvas._display.Redraw()
 
     def toggle_clip_plane(self, index):
@@ -287,6 +459,32 @@ class BuildingGenerator(QMainWindow):
                 
         self.canvas._display.Context.UpdateCurrentViewer()
       
+    def build_request(self, fit=False):
+        """Citește axele și opțiunile din panou; None dacă o valoare nu e număr."""
+        try:
+            x_interax = [float(x.text()) for x in self.x_inputs]
+            y_interax = [float(y.text()) for y in self.y_inputs]
+        except ValueError:
+            self.statusBar().showMessage("Interax values must be numbers")
+            return None
+
+        # Update covering visibility
+        self.show_interior_covering = self.interior_checkbox.isChecked()
+        self.show_exterior_covering = self.exterior_checkbox.isChecked()
+        self.show_roof = self.roof_checkbox.isChecked()
+        self.show_blender = self.blender_checkbox.isChecked()
+
+        # În timpul interacțiunii formele noi sunt triangulate grosier (vezi refine_meshes)
+        deflection = self.display_deflection()
+        options = dict(
+            show_interior_covering=self.show_interior_covering,
+            show_exterior_covering=self.show_exterior_covering,
+            show_roof=self.show_roof,
+            blender_json=BLENDER_JSON_PATH if self.show_blender else None,
+        )
+        return BuildRequest(x_interax, y_interax, options, deflection,
+                            COARSE_ANGLE if deflection > MESH_DEFLECTION else DEFAULT_ANGLE, fit)
+
     def update_geometry(self):
          
         # Detașăm manipulatorul existent înainte de a actualiza geometria
@@ -297,399 +495,139 @@ class BuildingGenerator(QMainWindow):
         # Curățăm lista de forme afișate
         self.displayed_shapes.clear()
 
-        # Get updated interax values
-        x_interax = [float(x.text()) for x in self.x_inputs]
-        y_interax = [float(y.text()) for y in self.y_inputs]
-                
-        # Update covering visibility
-        self.show_interior_covering = self.interior_checkbox.isChecked()
-        self.show_exterior_covering = self.exterior_checkbox.isChecked()
-        self.show_roof = self.roof_checkbox.isChecked()
-        self.show_blender = self.blender_checkbox.isChecked()
-        
-        # Clear previous display
-        self.canvas._display.EraseAll()
-        
-        # Generate and display new geometry
-        self.generate_building(x_interax, y_interax)
-
-        # Fit all objects in the viewer
-        self.canvas._display.FitAll()
-                 
+        # Construcția rulează în procesul de construcție; rezultatul ajunge în on_build_ready
+        request = self.build_request(fit=True)
+        if request is not None:
+            self.live.submit(request)
+
+    def schedule_update(self, *args):
+        """Editare în panou: regenerare după LIVE_DEBOUNCE_MS fără alte editări."""
+        request = self.build_request()
+        if request is not None:
+            self.live.schedule(request)
+
+    def on_build_ready(self, request, result, timer):
+        self.built = result.elements
+        with timer.stage('ui'):
+            self.display_result(request, result, timer)
+
+            # Fit all objects in the viewer
+            if request.fit:
+                with timer.stage('fit_all', 'display'):
+                    self.canvas._display.FitAll()
+
+        stats = result.cache_stats
+        instances = self.instanced.stats()
+        registry = self.registry.stats()
+        self.statusBar().showMessage(
+            f"Build {timer.totals['build']['seconds'] * 1000:.0f} ms, "
+            f"display {timer.totals['ui']['seconds'] * 1000:.0f} ms, "
+            f"{timer.totals['display'].get('redraws', 0)} redraws: {timer.status_text()} | "
+            f"Shape cache: {stats['hits']} hits, {stats['misses']} misses, "
+            f"{stats['entries']} entries, {stats['evictions']} evictions | "
+            f"{instances['prototypes']} prototypes, {instances['instances']} instances | "
+            f"AIS: {registry['created']} created, {registry['updated']} updated"
+        )
+        if TRACE_PATH:
+            timer.write_trace(TRACE_PATH)
+
+    def on_build_error(self, request, message):
+        self.statusBar().showMessage(message)
+
+    def on_build_abandoned(self, request):
+        """Construcția a fost anulată sau a eșuat: elementele ei deja afișate revin la ultimul rezultat."""
+        with self.instanced.batch():
+            self.reconcile(self.built)
+
+    def on_build_busy(self, busy):
+        if busy:
+            self.progress_bar.setValue(0)
+            self.statusBar().showMessage("Building...")
+        self.progress_bar.setVisible(busy)
+        self.cancel_button.setVisible(busy)
+
+    def on_build_progress(self, value, label):
+        self.progress_bar.setValue(int(value * 1000))
+        self.progress_bar.setToolTip(label)
+
+    def cancel_build(self):
+        """Oprește construcția după operația OCC în curs; modelul rămâne la ultimul rezultat terminat."""
+        self.live.cancel()
+        self.statusBar().showMessage("Build cancelled")
+
+    def closeEvent(self, event):
+        self.live.stop()
+        super().closeEvent(event)
     
     def window_placement(self, intersection_matrix, i, j, angle, offset, z_height=0):
-        if angle not in [0, 90, 180, 270]:
-            raise ValueError("Angle must be 0, 90, 180, or 270.")
-        
-        base_point = intersection_matrix[i, j]
-        x, y = base_point[0], base_point[1]
-        
-        if angle == 0:
-            x += offset
-        elif angle == 90:
-            y += offset
-        elif angle == 180:
-            x -= offset
-        elif angle == 270:
-            y -= offset
-        
-        return gp_Pnt(x, y, z_height), angle
-     
-
-    def generate_building(self, x_interax, y_interax):
-        # Generate the grid of intersection points
-        X, Y = np.meshgrid(x_interax, y_interax)
-        
-        # Create a list of coordinates (x, y)
-        coordinates_list = [[X[i, j], Y[i, j]] for i in range(X.shape[0]) for j in range(X.shape[1])]
-        
-        # Create the intersection matrix
-        intersection_matrix = np.dstack((X, Y))
-
-               # Add this new method to create and display the axis grid
-        create_axis_grid(self, x_interax, y_interax)
+        return window_placement(intersection_matrix, i, j, angle, offset, z_height)
+
+    def on_build_staged(self, request, stage, elements):
+        """Afișează elementele unei etape imediat ce procesul de construcție le-a terminat."""
+        self.set_drawer_deflection(request.deflection)
+        with self.instanced.batch(DISPLAY_FRAME_INTERVAL):
+            self.display_axes(request.x_interax, request.y_interax)
+            self.display_elements((element.element_id, element.digest, element.shapes) for element in elements)
+        self.statusBar().showMessage(f"Building... {stage} ready")
+
+    def display_axes(self, x_interax, y_interax):
+        # Add this new method to create and display the axis grid
+        if self.displayed_axes != (list(x_interax), list(y_interax)):
+            for ais in self.axis_ais:
+                self.instanced.remove(ais)
+            self.axis_ais = create_axis_grid(self, x_interax, y_interax, update=False)
+            self.instanced.changed()
+            self.displayed_axes = (list(x_interax), list(y_interax))
         #create_grid(self)
-    
-        def cut_with_bounding_boxes(resulting_shape, fenestration_params):
-            for params in fenestration_params:
-                fenestration = Fenestration(*params)
-                fenestration.create_frame()
-                fenestration.create_openings()
-                fenestration.create_panels()
-                fenestration.create_bounding_box()
-                
-                transformed_bounding_box = fenestration.apply_transformation(fenestration.bounding_box)
-                resulting_shape = BRepAlgoAPI_Cut(resulting_shape, transformed_bounding_box).Shape()
-            
-            return resulting_shape
 
-            # Creăm un plan de tăiere
+    def display_elements(self, items):
+        """
+        Afișează (id, digest, forme) pentru elementele a căror versiune afișată
+        diferă de digest; întoarce numărul de forme afișate sau actualizate.
+        """
+        # Creăm un plan de tăiere
         clip_plane = create_clip_plane()
-
-    # Adăugăm planul de tăiere la un obiect, de exemplu, o formă
-    # Aici ar trebui să aveți un obiect 3D existent la care să adăugați planul de tăiere.
-    # Presupunem că aveți un obiect numit `some_shape`.
-    # some_shape.AddClipPlane(clip_plane)  # Exemplu de utilizare
-
-    # Activăm planul de tăiere (de exemplu, la cererea utilizatorului)
-    # clip_plane.SetOn(True)
-
-        # Constants
-        height = 2.8
-
-        # Generate rooms
-        rooms = [
-            create_room_shape(intersection_matrix, [0, 0], [0, 1], [1, 1], [1, 0], 0.125),
-            create_room_shape(intersection_matrix, [0, 1], [0, 2], [2, 2], [2, 1], 0.125),
-            create_room_shape(intersection_matrix, [0, 2], [0, 3], [1, 3], [1, 2], 0.125),
-            create_room_shape(intersection_matrix, [1, 0], [1, 1], [3, 1], [3, 0], 0.125),
-            create_room_shape(intersection_matrix, [2, 1], [2, 2], [3, 2], [3, 1], 0.125),
-            create_room_shape(intersection_matrix, [1, 2], [1, 3], [3, 3], [3, 2], 0.125)
-        ]
-
-        # Generate foundation cells
-        foundation_cells = [
-            create_room_shape(intersection_matrix, [0, 0], [0, 1], [1, 1], [1, 0], 0.3),
-            create_room_shape(intersection_matrix, [0, 1], [0, 2], [2, 2], [2, 1], 0.3),
-            create_room_shape(intersection_matrix, [0, 2], [0, 3], [1, 3], [1, 2], 0.3),
-            create_room_shape(intersection_matrix, [1, 0], [1, 1], [3, 1], [3, 0], 0.3),
-            create_room_shape(intersection_matrix, [2, 1], [2, 2], [3, 2], [3, 1], 0.3),
-            create_room_shape(intersection_matrix, [1, 2], [1, 3], [3, 3], [3, 2], 0.3)
-        ]
-
-
-                # Generate interiour coverings
-        int_coverings = [
-            create_room_shape(intersection_matrix, [0, 0], [0, 1], [1, 1], [1, 0], 0.13),
-            create_room_shape(intersection_matrix, [0, 1], [0, 2], [2, 2], [2, 1], 0.13),
-            create_room_shape(intersection_matrix, [0, 2], [0, 3], [1, 3], [1, 2], 0.13),
-            create_room_shape(intersection_matrix, [1, 0], [1, 1], [3, 1], [3, 0], 0.13),
-            create_room_shape(intersection_matrix, [2, 1], [2, 2], [3, 2], [3, 1], 0.13),
-            create_room_shape(intersection_matrix, [1, 2], [1, 3], [3, 3], [3, 2], 0.13)
-        ]
-
-
-        # Create background face and prism
-        background_face = create_face(footprint_rectangle(intersection_matrix, [0, 0], [0, 3], [3, 3], [3, 0], 0.125))
-        background_prism = BRepPrimAPI_MakePrism(background_face, gp_Vec(0, 0, height)).Shape()
-
-        # Create outside covering face and prism
-        out_covering_face = create_face(footprint_rectangle(intersection_matrix, [0, 0], [0, 3], [3, 3], [3, 0], 0.225))
-        out_covering_prism = BRepPrimAPI_MakePrism(out_covering_face, gp_Vec(0, 0, height)).Shape()
-
-  
-        resulting_shape_out = BRepAlgoAPI_Cut(out_covering_prism, background_prism).Shape()
-        
-        # Create room prisms and cut from background
-        resulting_shape = background_prism
-        for room in rooms:
-            room_face = create_face(room)
-            room_prism = BRepPrimAPI_MakePrism(room_face, gp_Vec(0, 0, height)).Shape()
-            resulting_shape = BRepAlgoAPI_Cut(resulting_shape, room_prism).Shape()
-        
-        test = create_column_points(intersection_matrix, [(2, 0), (2, 3)], 0.25)
-
-        # Create room coverings and cut from background
-        resulting_coverings = []
-        for room, int_covering in zip(rooms, int_coverings):
-            room_face = create_face(room)
-            int_covering_face = create_face(int_covering)
-            room_prism = BRepPrimAPI_MakePrism(room_face, gp_Vec(0, 0, height)).Shape()
-            int_covering_prism = BRepPrimAPI_MakePrism(int_covering_face, gp_Vec(0, 0, height)).Shape()
-            resulting_shape_cov = BRepAlgoAPI_Cut(room_prism, int_covering_prism).Shape()
-            resulting_coverings.append(resulting_shape_cov)
-
-
-        cp = column_list(intersection_matrix, [(2, 0), (2, 3)])
-        print("coordinates columns", cp)
-        # Create columns
-        columns = [create_column(point) for point in cp]
-
-
-        for c in cp:
-            columns_dxf(c)
-
-        # Cut columns from the resulting shape
-        for col in columns:
-            resulting_shape = BRepAlgoAPI_Cut(resulting_shape, col).Shape()
-
-        
-        # Display columns
-        column_color = Quantity_Color(0.3, 0.3, 0.2, Quantity_TOC_RGB)
-        columns_volume = 0
-        for col in columns:
-            ais_col = self.canvas._display.DisplayShape(col, update=True, color=column_color)
-            columns_volume = columns_volume + calc_volume(col)
-            ais_col[0].AddClipPlane(clip_plane)
-
-        beam_matrix = beam_points(intersection_matrix, 0.25)
-        # Exemplu de utilizare:
-        # Presupunând că aveți deja columns_points definit
-        skipx = [(2,0), (2,2), (1, 1)]
-        skipy =[(1,0), (1,3)]
-        x_beams, y_beams = create_beam_pairs(beam_matrix, skipx, skipy)
-
-                # Exemplu de utilizare:
-        # Presupunând că aveți deja x_beams și y_beams definite
-        x_beam_contours = create_beam_contours(x_beams)
-        y_beam_contours = create_beam_contours(y_beams)
-
-        
-        beam_list =[]
-        drop_index = []
-        drop_index_y = [2, 11]
-        # Create beams
-        for i, beam in enumerate(x_beam_contours):
-            if i in drop_index:
-                continue
-              
-            x_beams_face = create_face(beam)
-            translated_x_beam_face = translate_face(x_beams_face, 2.55)
-            x_beam_prism = BRepPrimAPI_MakePrism(translated_x_beam_face, gp_Vec(0, 0, 0.25)).Shape()
-            beam_list.append(x_beam_prism)
-        
-        for i, beam in enumerate(y_beam_contours):
-            if i in drop_index_y:
+        count = 0
+        for element_id, element_digest, shapes in items:
+            if self.shown.get(element_id) == element_digest:
                 continue
-            y_beams_face = create_face(beam)
-            translated_y_beam_face = translate_face(y_beams_face, 2.55)
-            y_beam_prism = BRepPrimAPI_MakePrism(translated_y_beam_face, gp_Vec(0, 0, 0.25)).Shape()
-            beam_list.append(y_beam_prism)
-
-
-        # Create outside covering face and prism
-        grass = create_face(footprint_rectangle(intersection_matrix, [0, 0], [0, 3], [3, 3], [3, 0], 10.0))
-        translated_grass = translate_face(grass, -0.45)
-        translated_grass_prism = BRepPrimAPI_MakePrism(translated_grass, gp_Vec(0, 0, 0.1)).Shape()
-
-        # Create and display slabs
-        slab_color = Quantity_Color(0.8, 0.8, 0.8, Quantity_TOC_RGB)
-        room_slabs = []
-        for room in rooms:
-            room_face = create_face(room)
-            room_slab = BRepPrimAPI_MakePrism(room_face, gp_Vec(0, 0, 0.1)).Shape()
-            room_slabs.append(room_slab)
-            self.canvas._display.DisplayShape(room_slab, update=True, color=slab_color)
-
-    # Note: Fenestration and foundation elements are omitted for brevity
-    # You can add them following a similar pattern if needed
-
-        depth = -1.2
-        f_thickness = 0.45
-
-        # Boolean operation to cut rooms from the background prism and create foundations elevations
-
-        # Create background face and then prism
-        background_face = create_face(footprint_rectangle(intersection_matrix, [0, 0], [0, 3], [3, 3], [3, 0], 0.125))
-        background_prism_el = BRepPrimAPI_MakePrism(background_face, gp_Vec(0, 0, depth)).Shape()
-
-        resulting_shape_el = background_prism_el
-        for room in rooms:
-            room_face = create_face(room)
-            # Mutăm room_face cu -1.2 metri mai jos pe axa Z
-            translated_room_face = translate_face(room_face, -1.2)
-
-            elevation_prisme = BRepPrimAPI_MakePrism(room_face, gp_Vec(0, 0, depth)).Shape()
-            resulting_shape_el = BRepAlgoAPI_Cut(resulting_shape_el, elevation_prisme).Shape()
-
-        # Create exterior foundation contour
-        foundation_face = create_face(footprint_rectangle(intersection_matrix, [0, 0], [0, 3], [3, 3], [3, 0], 0.3))
-        translated_foundation_face = translate_face(foundation_face, -1.65)
-        foundation_prism = BRepPrimAPI_MakePrism(translated_foundation_face, gp_Vec(0, 0, f_thickness)).Shape()
-
-        resulting_shape_f = foundation_prism
-        for cell in foundation_cells:
-            f_face = create_face(cell)
-            translated_cell_face = translate_face(f_face, -1.65)
-            foundation_cell = BRepPrimAPI_MakePrism(translated_cell_face, gp_Vec(0, 0, f_thickness)).Shape()
-            resulting_shape_f = BRepAlgoAPI_Cut(resulting_shape_f, foundation_cell).Shape()
-
-        foundation_color = Quantity_Color(0.1, 0.1, 0.1, Quantity_TOC_RGB)
-        self.canvas._display.DisplayShape(resulting_shape_f, update=True, color=foundation_color)
-        foundation_volume = calc_volume(resulting_shape_f)
-
-
-        foundation_color = Quantity_Color(0.1, 0.1, 0.1, Quantity_TOC_RGB)
-        self.canvas._display.DisplayShape(resulting_shape_el, update=True, color=foundation_color)
-        elevation_volume = calc_volume (resulting_shape_el)
-        
-
-        fenestration_params = [
-            (*self.window_placement(intersection_matrix, 0, 1, 0, 0.5, 0.), 0.9, 2.1, 0.05, "double"),
-            (*self.window_placement(intersection_matrix, 0, 1, 90, 0.5, 0.), 0.9, 2.1, 0.05, "double"),
-            (*self.window_placement(intersection_matrix, 0, 2, 90, 0.5, 0.), 0.9, 2.1, 0.05, "double"),
-            (*self.window_placement(intersection_matrix, 1, 1, 90, 0.25, 0.), 0.9, 2.1, 0.05, "double"),
-            (*self.window_placement(intersection_matrix, 0, 2, 90, 0.5, 0.), 0.9, 2.1, 0.05, "double"),
-            (*self.window_placement(intersection_matrix, 1, 2, 90, 0.25, 0.), 0.9, 2.1, 0.05, "double"),
-            (*self.window_placement(intersection_matrix, 2, 1, 0, 0.5, 0.), 0.9, 2.1, 0.05, "double"),
-            (*self.window_placement(intersection_matrix, 0, 0, 0, 1.2, 0.9), 1.5, 1.2, 0.05, "single"),
-            (*self.window_placement(intersection_matrix, 0, 2, 0, 1.2, 0.9), 1.5, 1.2, 0.05, "single"),
-            (*self.window_placement(intersection_matrix, 1, 0, 90, 1.8, 0.9), 1.2, 1.2, 0.05, "single"),
-            (*self.window_placement(intersection_matrix, 1, 3, 90, 1.8, 0.9), 1.2, 1.2, 0.05, "single"),
-            (*self.window_placement(intersection_matrix, 3, 1, 0, 0.5, 1.2), 0.6, 0.9, 0.05, "single")
-        ]
-
-        for params in fenestration_params:
-            fenestration = Fenestration(*params)
-            fenestration.create_frame()
-            fenestration.create_openings()
-            fenestration.create_panels()
-            fenestration.create_bounding_box()
-         
-        resulting_shape1 = resulting_shape
-            # Tăiem resulting_shape cu boundingbox-urile ferestrelor
-        resulting_shape1 = cut_with_bounding_boxes(resulting_shape1, fenestration_params)
-
-        resulting_shape_out = cut_with_bounding_boxes(resulting_shape_out, fenestration_params)
-        resulting_shape_cov = cut_with_bounding_boxes(resulting_shape_cov, fenestration_params)
-
-        resulting_coverings1 = []
-        # Tăiem acoperirile cu boundingbox-urile ferestrelor
-        for covering in resulting_coverings:
-            result = cut_with_bounding_boxes(covering, fenestration_params)
-            resulting_coverings1.append(result)
-        
-        for params in fenestration_params:
-            fenestration = Fenestration(*params)
-            fenestration.create_frame()
-            fenestration.create_openings()
-            fenestration.create_panels()
-
-            
-            for shape in fenestration.get_shapes():
-                self.canvas._display.Context.Display(shape, True)
-         
-        for b in beam_list:
-            resulting_shape1 = BRepAlgoAPI_Cut(resulting_shape1, b).Shape()
-
-        # Display the resulting shape
-        resulting_shape_color = Quantity_Color(0.796, 0.255, 0.329, Quantity_TOC_RGB)
-        self.canvas._display.DisplayShape(resulting_shape1, update=True, color=resulting_shape_color)
-        wall_volume = calc_volume(resulting_shape1)
-
-
-         # Display beams
-        beam_volumes = 0
-        beam_color = Quantity_Color(0.3, 0.3, 0.3, Quantity_TOC_RGB)
-        for b in beam_list:
-            self.canvas._display.DisplayShape(b, update=True, color=beam_color)
-            beam_volumes = beam_volumes + calc_volume(b)
-
-
-        # Display outside covering 
-        if self.show_exterior_covering:
-            out_covering_color = Quantity_Color(1, 1, 0.5, Quantity_TOC_RGB)
-           #self.display_shape_with_clip(resulting_shape_out, out_covering_color)
-            self.canvas._display.DisplayShape(resulting_shape_out, update=True, color=out_covering_color)
-
-        # Display interior coverings
-        if self.show_interior_covering:
-            covering_color = Quantity_Color(0.9, 0.9, 0.9, Quantity_TOC_RGB)
-            for covering in resulting_coverings1:
-                #self.display_shape_with_clip(covering, covering_color)
-                self.canvas._display.DisplayShape(covering, update=True, color=covering_color)
-
-
-        point_01 = intersection_matrix[-1,-1]
-        point_max = [point_01[0]+1.8, point_01[1] + 1.8]
-        insert_01 = intersection_matrix[0, 0]
-        height_r = 2.8
-        insertion_point_r = [insert_01[0]-0.9, insert_01[1]-0.9, height_r]
-
-        roof_height = 2
-        extruded_compound = roof_01(point_max, insertion_point_r, height_r, roof_height, 0.3)
-        # Setarea culorii și transparenței acoperișului extrudat
-        roof_color = Quantity_Color(0.647, 0.165, 0.165, Quantity_TOC_RGB)  
-        extruded_shape_r = AIS_Shape(extruded_compound)
-        extruded_shape_r.SetColor(roof_color)
-        extruded_shape_r.SetTransparency(0.6)  # Fără transparență
-
-        grass_color = Quantity_Color(0, 1, 0, Quantity_TOC_RGB)
-        self.canvas._display.DisplayShape(translated_grass_prism, update=True, color=grass_color)
-        self.canvas._display.View.SetBgGradientColors(Quantity_Color(Quantity_NOC_ALICEBLUE), Quantity_Color(Quantity_NOC_ANTIQUEWHITE), 2, True,
-)
-              
-        #self.canvas._display.DisplayShape(extruded_compound, update=True, color=roof_color)
-        # Display roof
-        if self.show_roof:
-            self.canvas._display.DisplayShape(extruded_compound, update=True, color=roof_color)
-        
-
-        if self.show_blender:
-                            # Calea către fișierul JSON
-            filepath = "C:\\Users\\ciunt\\OneDrive\\Desktop\\exports\\mesh_export.json"
-            
-            # Citește fișierul JSON
-            print("Se citește fișierul JSON...")
-            mesh_data = read_json(filepath)
-            print("Fișierul a fost citit cu succes")
-            
-            # Creează obiectul din fețele JSON
-            print("Se construiește obiectul 3D doar din fețe...")
-            compound = build_faces_from_json(mesh_data)
-            print("Obiectul a fost construit cu succes")
-
-           
-            # Afișăm obiectul
-            self.canvas._display.DisplayShape(compound, transparency=0.5, update=True)
-            print("Obiectul a fost afișat cu succes")
-        
-
-        # Function to calculate the volume of a shape using pythonOCC
-        volumes_dict = {
-            'Foundation': foundation_volume,        # Replace with your actual shapes
-            'Elevation': elevation_volume, 
-            'Beams': beam_volumes,
-            'Columns': columns_volume,
-            'Walls': wall_volume
-            }
-        # Step 2: Save the dictionary to a JSON file
-        def save_volumes_to_json(volumes_dict, filename):
-            with open(filename, 'w') as json_file:
-                json.dump(volumes_dict, json_file)
-
-        # Save the volumes to a JSON file
-        save_volumes_to_json(volumes_dict, 'volumes.json')
+            for name, ais in self.registry.update(element_id, shapes, ELEMENT_STYLES):
+                if name == 'columns':
+                    ais.AddClipPlane(clip_plane)
+            self.shown[element_id] = element_digest
+            count += len(shapes)
+        return count
+
+    def reconcile(self, elements):
+        """
+        Aduce afișarea la `elements` (ID -> element) după digest: șterge elementele
+        care lipsesc și actualizează restul; întoarce numărul de forme afișate.
+        """
+        for element_id in [i for i in self.shown if i not in elements]:
+            self.registry.remove(element_id)
+            del self.shown[element_id]
+        return self.display_elements(
+            (element_id, element.digest, element.shapes) for element_id, element in elements.items())
+
+    def display_result(self, request, result, timer):
+        # Geometria e calculată și triangulată în procesul de construcție, aici doar se afișează
+        self.set_drawer_deflection(request.deflection)
+
+        redraws = self.instanced.redraws
+        # Toate prezentările sunt puse în context fără redesenare; viewer-ul e
+        # actualizat o singură dată la ieșirea din batch (sau la DISPLAY_FRAME_INTERVAL)
+        with timer.stage('display', shapes=0) as event:
+            with self.instanced.batch(DISPLAY_FRAME_INTERVAL):
+                self.display_axes(request.x_interax, request.y_interax)
+
+                # Afișarea e comparată cu rezultatul final după digest, nu după result.changed:
+                # elementele trimise pe etape (inclusiv din construcții anulate) sunt deja
+                # la zi sau sunt corectate aici; cele neschimbate nu sunt atinse
+                event['shapes'] += self.reconcile(result.elements)
+
+                self.canvas._display.View.SetBgGradientColors(Quantity_Color(Quantity_NOC_ALICEBLUE), Quantity_Color(Quantity_NOC_ANTIQUEWHITE), 2, False)
+                self.instanced.changed()
+            event['redraws'] = self.instanced.redraws - redraws
 
     def show_graphs(self):
         filename = 'volumes.json'
@@ -0,0 +1,60 @@
+import math
+from OCC.Core.gp import gp_Pnt, gp_Dir, gp_Ax2
+from OCC.Core.BRepPrimAPI import BRepPrimAPI_MakeBox, BRepPrimAPI_MakeCylinder
+from geometry_utils import box_volume, place_shape
+from shape_cache import memoize
+
+# Tipuri de stâlpi parametrici. Fiecare tip are un singur prototip, centrat în
+# origine, iar stâlpii sunt plasări ale acestuia (place_shape), nu cutii noi.
+# Volumul se calculează analitic din secțiune, fără GProp.
+
+SECTIONS = ('rectangular', 'circular')
+
+
+class ColumnType:
+    """
+    Secțiunea și înălțimea unui tip de stâlp.
+
+    Args:
+        section (str): 'rectangular' sau 'circular'.
+        width (float): Latura pe X (secțiune dreptunghiulară) sau diametrul (circulară).
+        depth (float): Latura pe Y; ignorată pentru secțiunea circulară.
+        height (float): Înălțimea stâlpului.
+    """
+
+    def __init__(self, section='rectangular', width=0.25, depth=0.25, height=2.8):
+        if section not in SECTIONS:
+            raise ValueError(f"Unknown column section: {section}")
+        self.section = section
+        self.width = float(width)
+        self.depth = float(depth) if section == 'rectangular' else float(width)
+        self.height = float(height)
+
+    def prototype(self):
+        return column_prototype(self.section, self.width, self.depth, self.height)
+
+    def volume(self):
+        return prototype_volume(self.section, self.width, self.depth, self.height)
+
+    def place(self, point, z=0.0):
+        return place_shape(self.prototype(), point[0], point[1], z)
+
+
+@memoize('column_prototype')
+def column_prototype(section, width, depth, height):
+    if section == 'circular':
+        axis = gp_Ax2(gp_Pnt(0, 0, 0), gp_Dir(0, 0, 1))
+        return BRepPrimAPI_MakeCylinder(axis, width / 2, height).Shape()
+    return BRepPrimAPI_MakeBox(gp_Pnt(-width / 2, -depth / 2, 0), width, depth, height).Shape()
+
+
+def prototype_volume(section, width, depth, height):
+    if section == 'circular':
+        return math.pi * (width / 2) ** 2 * height
+    return box_volume(width, depth, height)
+
+
+DEFAULT_COLUMN = ColumnType()
+
+# Nivelurile de stâlpi: (cota de bază, tip de stâlp)
+DEFAULT_LEVELS = [(0.0, DEFAULT_COLUMN)]
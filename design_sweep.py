@@ -0,0 +1,184 @@
+import argparse
+import csv
+import itertools
+import json
+import os
+import sys
+import time
+import traceback
+from multiprocessing import get_context
+
+from building_engine import VOLUME_GROUPS
+
+# Rulează building_engine pe multe configurații de interax în paralel.
+# Fiecare proces importă OCC o singură dată (initializer) și întoarce doar
+# un rând mic (volume, eroare, timpi), niciodată forme OCC.
+
+VOLUME_COLUMNS = list(VOLUME_GROUPS)
+ROW_COLUMNS = ['variant', 'x_interax', 'y_interax', 'status', 'error', 'build_seconds', 'worker'] + VOLUME_COLUMNS
+
+_build_building = None
+_build_options = {}
+
+
+def _init_worker(build_options):
+    """Importă motorul o singură dată per proces și încălzește OCC cu o clădire mică."""
+    global _build_building, _build_options
+    from building_engine import build_building
+    from booleans import configure_booleans
+    # Paralelismul vine din procese; firele OCC ale fiecărui worker ar suprasolicita CPU-ul
+    configure_booleans(parallel=False)
+    _build_building = build_building
+    _build_options = build_options
+    try:
+        _build_building([0, 4, 7, 10], [0, 5, 6.5, 10], **_build_options)
+    except Exception:
+        # Încălzirea e opțională, dar eroarea ei anunță de obicei aceeași eroare pe fiecare variantă
+        print(f"Worker {os.getpid()}: warm-up build failed", file=sys.stderr)
+        traceback.print_exc(file=sys.stderr)
+
+
+def _run_variant(variant):
+    index, x_interax, y_interax = variant
+    row = {
+        'variant': index,
+        'x_interax': json.dumps(list(x_interax)),
+        'y_interax': json.dumps(list(y_interax)),
+        'status': 'ok',
+        'error': '',
+        'worker': os.getpid(),
+    }
+    start = time.perf_counter()
+    try:
+        result = _build_building(list(x_interax), list(y_interax), **_build_options)
+        row.update(result.volumes)
+    except Exception as exc:
+        row['status'] = 'failed'
+        row['error'] = f"{type(exc).__name__}: {exc}"
+        traceback.print_exc(file=sys.stderr)
+    row['build_seconds'] = time.perf_counter() - start
+    return row
+
+
+def interax_from_spans(spans, origin=0.0):
+    """Transformă deschiderile (distanțele dintre axe) în coordonate de axe."""
+    axes = [origin]
+    for span in spans:
+        axes.append(axes[-1] + span)
+    return axes
+
+
+def generate_variants(x_candidates, y_candidates):
+    """Produsul cartezian al candidaților X și Y, numerotat."""
+    for index, (x_interax, y_interax) in enumerate(itertools.product(x_candidates, y_candidates)):
+        yield index, x_interax, y_interax
+
+
+class CsvSink:
+    def __init__(self, filename):
+        self.file = open(filename, 'w', newline='')
+        self.writer = csv.DictWriter(self.file, fieldnames=ROW_COLUMNS, extrasaction='ignore')
+        self.writer.writeheader()
+
+    def write(self, row):
+        self.writer.writerow(row)
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+class ParquetSink:
+    """Scrie rândurile în grupuri de `batch_size`, ca fișierul să crească pe parcurs."""
+
+    def __init__(self, filename, batch_size=256):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        self.pa = pa
+        fields = [(name, pa.string()) for name in ['x_interax', 'y_interax', 'status', 'error']]
+        fields += [('variant', pa.int64()), ('worker', pa.int64()), ('build_seconds', pa.float64())]
+        fields += [(name, pa.float64()) for name in VOLUME_COLUMNS]
+        self.schema = pa.schema(fields)
+        self.writer = pq.ParquetWriter(filename, self.schema)
+        self.batch_size = batch_size
+        self.rows = []
+
+    def write(self, row):
+        self.rows.append(row)
+        if len(self.rows) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self.rows:
+            return
+        columns = {name: [row.get(name) for row in self.rows] for name in self.schema.names}
+        self.writer.write_table(self.pa.Table.from_pydict(columns, schema=self.schema))
+        self.rows = []
+
+    def close(self):
+        self.flush()
+        self.writer.close()
+
+
+def open_sink(filename):
+    if filename.endswith('.parquet'):
+        return ParquetSink(filename)
+    return CsvSink(filename)
+
+
+def run_sweep(variants, output, processes=None, build_options=None, chunksize=1):
+    """
+    Rulează variantele pe un pool de procese și scrie un rând per variantă pe măsură ce termină.
+
+    Returns:
+        dict: Numărul de variante reușite/eșuate și durata totală.
+    """
+    processes = processes or os.cpu_count()
+    sink = open_sink(output)
+    summary = {'ok': 0, 'failed': 0}
+    start = time.perf_counter()
+    # "spawn" evită moștenirea stării OCC din procesul părinte
+    with get_context('spawn').Pool(processes, initializer=_init_worker, initargs=(build_options or {},)) as pool:
+        try:
+            for row in pool.imap_unordered(_run_variant, variants, chunksize=chunksize):
+                sink.write(row)
+                summary[row['status']] += 1
+        finally:
+            sink.close()
+    summary['seconds'] = time.perf_counter() - start
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Baleiaj de configurații de interax pe un pool de procese.")
+    parser.add_argument('config', help="JSON cu listele de candidați: {\"x\": [[...], ...], \"y\": [[...], ...]}"
+                                       " sau cu deschideri: {\"x_spans\": [[...], ...], \"y_spans\": [[...], ...]}")
+    parser.add_argument('-o', '--output', default='sweep.csv', help="Fișier .csv sau .parquet")
+    parser.add_argument('-j', '--processes', type=int, default=None, help="Număr de procese (implicit: toate nucleele)")
+    parser.add_argument('--chunksize', type=int, default=1)
+    parser.add_argument('--with-coverings', action='store_true', help="Calculează și finisajele (nu intră în volume)")
+    parser.add_argument('--with-roof', action='store_true', help="Calculează și acoperișul (nu intră în volume)")
+    parser.add_argument('--cache-dir', help="Cache persistent comun tuturor proceselor; variantele identice se refolosesc")
+    args = parser.parse_args(argv)
+
+    with open(args.config) as f:
+        config = json.load(f)
+    x_candidates = config.get('x') or [interax_from_spans(s) for s in config['x_spans']]
+    y_candidates = config.get('y') or [interax_from_spans(s) for s in config['y_spans']]
+
+    build_options = {
+        'show_interior_covering': args.with_coverings,
+        'show_exterior_covering': args.with_coverings,
+        'show_roof': args.with_roof,
+    }
+    if args.cache_dir:
+        from disk_cache import DiskCache
+        build_options['disk_cache'] = DiskCache(args.cache_dir)
+    summary = run_sweep(generate_variants(x_candidates, y_candidates), args.output,
+                        args.processes, build_options, args.chunksize)
+    print(json.dumps(summary))
+    return 0 if summary['failed'] == 0 else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,182 @@
+import hashlib
+import json
+import os
+import tempfile
+from OCC.Core.BinTools import bintools_Write, bintools_Read
+from OCC.Core.TopoDS import TopoDS_Shape
+from meshing import mesh_shape, MESH_DEFLECTION, DEFAULT_ANGLE
+
+# Cache persistent, adresat după conținut, pentru rezultatele scumpe (BRep binar
+# cu triangulare). Structura directorului:
+#   objects/<sha256 al fișierului>.bin  - forma, o singură dată chiar dacă apare în mai multe variante
+#   keys/<sha256 al intrărilor>.json    - {"object": ..., "volume": ...}
+#   refs/<sha256 al fișierului>.txt     - cheile care au trimis la obiect, câte una pe linie
+#                                         (indexul invers folosit la evacuare)
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    'HOUSEMAKER_CACHE', os.path.join(os.path.expanduser('~'), '.cache', 'housemaker'))
+
+
+def digest(*parts):
+    """SHA-256 peste reprezentarea textuală a părților (chei deja normalizate)."""
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(repr(part).encode())
+        h.update(b'\0')
+    return h.hexdigest()
+
+
+class DiskCache:
+    """
+    Args:
+        directory (str): Directorul cache-ului.
+        max_bytes (int): Dimensiunea maximă a obiectelor; cele mai vechi (după
+            ultima folosire) sunt șterse la depășire. Totalul e citit din director
+            la creare și după fiecare evacuare; între ele, scrierile altor procese
+            nu sunt numărate.
+        mesh (bool): Triangulează forma înainte de scriere (meshing.MESH_DEFLECTION),
+            ca să nu mai fie triangulată la afișare după un start „cald”.
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=2 * 1024 ** 3, mesh=True):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.mesh = mesh
+        self.objects_dir = os.path.join(directory, 'objects')
+        self.keys_dir = os.path.join(directory, 'keys')
+        self.refs_dir = os.path.join(directory, 'refs')
+        os.makedirs(self.objects_dir, exist_ok=True)
+        os.makedirs(self.keys_dir, exist_ok=True)
+        os.makedirs(self.refs_dir, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self.total_bytes = self._scan()[1]
+
+    def _key_path(self, key):
+        return os.path.join(self.keys_dir, f"{key}.json")
+
+    def _object_path(self, name):
+        return os.path.join(self.objects_dir, f"{name}.bin")
+
+    def _refs_path(self, name):
+        return os.path.join(self.refs_dir, f"{name}.txt")
+
+    def get(self, key):
+        """Întoarce (formă, metadate) sau None dacă cheia lipsește."""
+        try:
+            with open(self._key_path(key)) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        path = self._object_path(entry['object'])
+        shape = TopoDS_Shape()
+        if not os.path.exists(path) or not bintools_Read(shape, path):
+            # Obiectul a fost evacuat; referința nu mai e valabilă
+            self._remove(self._key_path(key))
+            self.misses += 1
+            return None
+        self._touch(path)
+        self.hits += 1
+        return shape, entry
+
+    def put(self, key, shape, deflection=MESH_DEFLECTION, angle=DEFAULT_ANGLE, **metadata):
+        """Scrie forma (triangulată cu deflecția dată, dacă mesh=True) și metadatele sub cheie."""
+        if self.mesh:
+            mesh_shape(shape, deflection, angle)
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.objects_dir, suffix='.tmp')
+        os.close(fd)
+        try:
+            bintools_Write(shape, tmp_path)
+            with open(tmp_path, 'rb') as f:
+                name = hashlib.sha256(f.read()).hexdigest()
+            path = self._object_path(name)
+            is_new = not os.path.exists(path)
+            if is_new:
+                os.replace(tmp_path, path)
+            elif not self._touch(path):
+                # Evacuat de alt proces între verificare și atingere
+                os.replace(tmp_path, path)
+                is_new = True
+        finally:
+            self._remove(tmp_path)
+
+        with open(self._refs_path(name), 'a') as f:
+            f.write(key + '\n')
+        entry = dict(metadata, object=name)
+        tmp_key = self._key_path(key) + '.tmp'
+        with open(tmp_key, 'w') as f:
+            json.dump(entry, f)
+        os.replace(tmp_key, self._key_path(key))
+        if is_new:
+            try:
+                self.total_bytes += os.path.getsize(path)
+            except OSError:
+                pass
+            if self.total_bytes > self.max_bytes:
+                self.evict()
+
+    def _scan(self):
+        """([(mtime, mărime, nume), ...], total) pentru obiectele din director; cele dispărute sunt ignorate."""
+        objects = []
+        for entry in os.scandir(self.objects_dir):
+            if entry.name.endswith('.bin'):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                objects.append((stat.st_mtime, stat.st_size, entry.name[:-len('.bin')]))
+        return objects, sum(size for _, size, _ in objects)
+
+    def evict(self):
+        """
+        Șterge cele mai vechi obiecte peste max_bytes, apoi cheile care trimiteau la ele.
+        Alte procese pot evacua în același timp; fișierele dispărute între timp sunt ignorate.
+        """
+        objects, self.total_bytes = self._scan()
+        for _, size, name in sorted(objects):
+            if self.total_bytes <= self.max_bytes:
+                break
+            self._remove(self._object_path(name))
+            self._evict_keys(name)
+            self.total_bytes -= size
+
+    def _evict_keys(self, name):
+        """Șterge cheile din refs/ care încă trimit la obiectul `name`, apoi lista lor."""
+        refs = self._refs_path(name)
+        try:
+            with open(refs) as f:
+                keys = f.read().split()
+        except OSError:
+            keys = []
+        for key in keys:
+            path = self._key_path(key)
+            try:
+                with open(path) as f:
+                    current = json.load(f).get('object')
+            except (OSError, ValueError):
+                continue
+            # Cheia poate să fi fost rescrisă între timp spre alt obiect
+            if current == name:
+                self._remove(path)
+        self._remove(refs)
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses}
+
+    @staticmethod
+    def _touch(path):
+        """Marchează obiectul ca folosit; False dacă a fost evacuat între timp."""
+        try:
+            os.utime(path)
+            return True
+        except OSError:
+            return False
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
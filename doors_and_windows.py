@@ -1,6 +1,6 @@
 from OCC.Core.gp import gp_Pnt, gp_Trsf, gp_Ax1, gp_Dir
 from OCC.Core.BRepPrimAPI import BRepPrimAPI_MakeBox
-from OCC.Core.BRepAlgoAPI import BRepAlgoAPI_Cut
+from booleans import cut_many
 from OCC.Core.BRepBuilderAPI import BRepBuilderAPI_Transform
 from OCC.Core.AIS import AIS_Shape
 from OCC.Core.Quantity import Quantity_Color, Quantity_TOC_RGB
@@ -34,10 +34,9 @@ class Fenestration:
             left_top_opening = BRepPrimAPI_MakeBox(gp_Pnt(50, -1, opening_height + 50), opening_width, opening_depth, opening_height).Shape()
             right_top_opening = BRepPrimAPI_MakeBox(gp_Pnt(self.width / 2 + 25, -1, opening_height + 50), opening_width, opening_depth, opening_height).Shape()
 
-            self.window = BRepAlgoAPI_Cut(self.frame, left_bottom_opening).Shape()
-            self.window = BRepAlgoAPI_Cut(self.window, right_bottom_opening).Shape()
-            self.window = BRepAlgoAPI_Cut(self.window, left_top_opening).Shape()
-            self.window = BRepAlgoAPI_Cut(self.window, right_top_opening).Shape()
+            self.window = cut_many(self.frame, [left_bottom_opening, right_bottom_opening,
+                                                left_top_opening, right_top_opening],
+                                   site='fenestration_openings')
         else:  # "single"
             opening_width = 500.0
             opening_height = 1100.0
@@ -46,8 +45,7 @@ class Fenestration:
             left_opening = BRepPrimAPI_MakeBox(gp_Pnt(50, -1, 50), opening_width, opening_depth, opening_height).Shape()
             right_opening = BRepPrimAPI_MakeBox(gp_Pnt(self.width / 2 + 25, -1, 50), opening_width, opening_depth, opening_height).Shape()
 
-            self.window = BRepAlgoAPI_Cut(self.frame, left_opening).Shape()
-            self.window = BRepAlgoAPI_Cut(self.window, right_opening).Shape()
+            self.window = cut_many(self.frame, [left_opening, right_opening], site='fenestration_openings')
 
     def create_panels(self):
         if self.window_type == "double":
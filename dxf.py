@@ -1,3 +1,4 @@
+import os
 import ezdxf
 
 def columns_dxf(insertion_points):
@@ -55,6 +56,39 @@ def columns_dxf(insertion_points):
 
     print("Geometria a fost adăugată cu succes!")
 
+def columns_dxf_batch(insertion_points, filename, width=0.25, height=0.25, append=False):
+    """
+    Scrie toate coloanele într-un singur document DXF, salvat o singură dată.
+
+    Implicit fișierul e suprascris cu un document nou; cu append=True un
+    fișier existent este completat (coloanele se adaugă la cele deja desenate).
+    """
+    if append and os.path.exists(filename):
+        doc = ezdxf.readfile(filename)
+    else:
+        doc = ezdxf.new('R2010')
+
+    layer_name = 'stalpi'
+    if layer_name not in doc.layers:
+        doc.layers.add(name=layer_name, lineweight=40)
+
+    msp = doc.modelspace()
+    for insertion_point in insertion_points:
+        x1, y1 = insertion_point[0], insertion_point[1]
+        x2, y2 = x1 + width, y1 + height
+
+        lwpolyline = msp.add_lwpolyline([(x1, y1), (x2, y1), (x2, y2), (x1, y2), (x1, y1)],
+                                        close=True, dxfattribs={'layer': layer_name})
+        hatch = msp.add_hatch(color=7, dxfattribs={'layer': layer_name})
+        path = hatch.paths.add_polyline_path(
+            lwpolyline.get_points(format="xyb"),
+            is_closed=lwpolyline.closed,
+        )
+        hatch.set_pattern_fill("ANSI31", scale=0.5)
+        hatch.associate(path, [lwpolyline])
+
+    doc.saveas(filename)
+
 def dxf (insertion_point, width, height, file):
     # Crează un document nou DXF
     doc = ezdxf.new('R2010')
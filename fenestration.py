@@ -1,10 +1,27 @@
 import numpy as np
 from OCC.Core.gp import gp_Pnt, gp_Vec, gp_Trsf, gp_Ax1, gp_Dir
 from OCC.Core.BRepPrimAPI import BRepPrimAPI_MakeBox
-from OCC.Core.BRepBuilderAPI import BRepBuilderAPI_Transform
-from OCC.Core.BRepAlgoAPI import BRepAlgoAPI_Cut
+from OCC.Core.TopLoc import TopLoc_Location
 from OCC.Core.AIS import AIS_Shape
 from OCC.Core.Quantity import Quantity_Color, Quantity_TOC_RGB
+from booleans import cut_many, cut
+from shape_cache import memoize
+
+# Cutia de încadrare (golul tăiat în pereți și finisaje): marginea în jurul ramei
+# și adâncimea, centrată pe spatele ramei
+BOX_MARGIN = 0.01
+BOX_DEPTH = 0.6
+
+
+def bounding_footprint(insertion_point, rotation_angle, width, depth):
+    """Colțurile în plan (4, 2) ale cutiei de încadrare plasate, fără a construi geometria."""
+    x0, x1 = -BOX_MARGIN, width + BOX_MARGIN
+    y0, y1 = depth - BOX_DEPTH / 2, depth + BOX_DEPTH / 2
+    local = np.array([[x0, y0], [x1, y0], [x1, y1], [x0, y1]])
+    angle = np.radians(rotation_angle)
+    rotation = np.array([[np.cos(angle), -np.sin(angle)], [np.sin(angle), np.cos(angle)]])
+    return local @ rotation.T + (insertion_point.X(), insertion_point.Y())
+
 
 class Fenestration:
     def __init__(self, insertion_point, rotation_angle, width, height, depth, window_type="double"):
@@ -20,6 +37,23 @@ class Fenestration:
         self.wood_panels = []
         self.bounding_box = None
 
+    @classmethod
+    def from_template(cls, insertion_point, rotation_angle, width, height, depth, window_type="double"):
+        """
+        Fereastră plasată care refolosește geometria șablonului pentru (tip, lățime, înălțime, adâncime).
+
+        Rama, golurile și panourile se construiesc o singură dată în coordonate locale;
+        fiecare fereastră diferă doar prin transformarea aplicată în apply_transformation.
+        """
+        template = fenestration_template(window_type, float(width), float(height), float(depth))
+        fenestration = cls(insertion_point, rotation_angle, width, height, depth, window_type)
+        fenestration.frame = template.frame
+        fenestration.window = template.window
+        fenestration.glass_panels = list(template.glass_panels)
+        fenestration.wood_panels = list(template.wood_panels)
+        fenestration.bounding_box = template.bounding_box
+        return fenestration
+
     def create_frame(self):
         self.frame = BRepPrimAPI_MakeBox(gp_Pnt(0, 0, 0), 
                                          self.width, 
@@ -37,17 +71,16 @@ class Fenestration:
             left_top_opening = BRepPrimAPI_MakeBox(gp_Pnt(0.05, -0.001, opening_height + 0.05), opening_width, opening_depth, opening_height).Shape()
             right_top_opening = BRepPrimAPI_MakeBox(gp_Pnt(self.width / 2 + 0.025, -0.001, opening_height + 0.05), opening_width, opening_depth, opening_height).Shape()
 
-            self.window = BRepAlgoAPI_Cut(self.frame, left_bottom_opening).Shape()
-            self.window = BRepAlgoAPI_Cut(self.window, right_bottom_opening).Shape()
-            self.window = BRepAlgoAPI_Cut(self.window, left_top_opening).Shape()
-            self.window = BRepAlgoAPI_Cut(self.window, right_top_opening).Shape()
+            self.window = cut_many(self.frame, [left_bottom_opening, right_bottom_opening,
+                                                left_top_opening, right_top_opening],
+                                   site='fenestration_openings')
         else:  # "single"
             opening_width = self.width - 0.1
             opening_height = self.height - 0.1
             opening_depth = self.depth + 0.001
 
             opening = BRepPrimAPI_MakeBox(gp_Pnt(0.05, -0.001, 0.05), opening_width, opening_depth, opening_height).Shape()
-            self.window = BRepAlgoAPI_Cut(self.frame, opening).Shape()
+            self.window = cut(self.frame, opening, site='fenestration_openings')
 
     def create_panels(self):
         if self.window_type == "double":
@@ -69,13 +102,13 @@ class Fenestration:
             self.glass_panels.append(glass)
 
     def create_bounding_box(self):
-        bounding_box_width = self.width + 0.02
-        bounding_box_height = self.height + 0.02
-        bounding_box_depth = 0.6
-        bounding_box_position = gp_Pnt(-0.01, self.depth - 0.3, -0.01)
+        bounding_box_width = self.width + 2 * BOX_MARGIN
+        bounding_box_height = self.height + 2 * BOX_MARGIN
+        bounding_box_depth = BOX_DEPTH
+        bounding_box_position = gp_Pnt(-BOX_MARGIN, self.depth - BOX_DEPTH / 2, -BOX_MARGIN)
         self.bounding_box = BRepPrimAPI_MakeBox(bounding_box_position, bounding_box_width, bounding_box_depth, bounding_box_height).Shape()
 
-    def apply_transformation(self, shape):
+    def placement(self):
         translation_trsf = gp_Trsf()
         translation_trsf.SetTranslation(gp_Pnt(0, 0, 0), self.insertion_point)
         
@@ -87,9 +120,19 @@ class Fenestration:
         combined_trsf = gp_Trsf()
         combined_trsf.Multiply(rotation_trsf)
         combined_trsf.Multiply(translation_trsf)
-        
-        transformer = BRepBuilderAPI_Transform(shape, combined_trsf)
-        return transformer.Shape()
+        return combined_trsf
+
+    def apply_transformation(self, shape):
+        # Transformarea e rigidă: o locație pe formă ajunge, fără copierea geometriei
+        return shape.Moved(TopLoc_Location(self.placement()))
+
+    def get_transformed_shapes(self):
+        """Return the placed window, glass and wood shapes without creating AIS objects."""
+        return {
+            'window': self.apply_transformation(self.window),
+            'glass': [self.apply_transformation(glass_panel) for glass_panel in self.glass_panels],
+            'wood': [self.apply_transformation(wood_panel) for wood_panel in self.wood_panels],
+        }
 
     def get_shapes(self):
         shapes = []
@@ -119,4 +162,15 @@ class Fenestration:
             bounding_box_shape.SetTransparency(0.7)
             shapes.append(bounding_box_shape)
         
-        return shapes
\ No newline at end of file
+        return shapes
+
+
+@memoize('fenestration_template')
+def fenestration_template(window_type, width, height, depth):
+    """Construiește o singură dată geometria locală a unui tip de fereastră."""
+    template = Fenestration(gp_Pnt(0, 0, 0), 0.0, width, height, depth, window_type)
+    template.create_frame()
+    template.create_openings()
+    template.create_panels()
+    template.create_bounding_box()
+    return template
@@ -4,15 +4,76 @@ from OCC.Core.BRepBuilderAPI import BRepBuilderAPI_MakePolygon, BRepBuilderAPI_M
 from OCC.Core.BRepPrimAPI import BRepPrimAPI_MakeBox, BRepPrimAPI_MakePrism
 from OCC.Core.AIS import AIS_Shape, AIS_TextLabel
 from OCC.Core.Quantity import Quantity_Color, Quantity_TOC_RGB
-from PyQt5.QtWidgets import QComboBox, QColorDialog
 from OCC.Core.GProp import GProp_GProps
 from OCC.Core.BRepGProp import brepgprop_VolumeProperties
+from OCC.Core.TopLoc import TopLoc_Location
+from shape_cache import memoize, ShapeCache, estimate_bytes
+
+# Volumele calculate cu GProp, cheiate după forma fără locație: toate
+# instanțele plasate ale aceluiași prototip au același volum. Doar instanțele
+# plasate sunt păstrate (pereții și finisajele se schimbă la fiecare construcție),
+# iar cheia, care ține forma vie, intră în bugetul de memorie.
+VOLUME_CACHE = ShapeCache(max_entries=16384, max_bytes=64 * 1024 * 1024)
+
 
 # Function to calculate the volume of a shape using pythonOCC
 def calc_volume(shape):
+    instanced = not shape.Location().IsIdentity()
+    key = shape.Located(TopLoc_Location())
+    if instanced:
+        entry = VOLUME_CACHE.get(key)
+        if entry is not None:
+            return entry[0]
     props = GProp_GProps()
     brepgprop_VolumeProperties(shape, props)
-    return props.Mass()
+    volume = props.Mass()
+    if instanced:
+        VOLUME_CACHE.put(key, volume, estimate_bytes(key) + estimate_bytes(volume))
+    return volume
+
+
+def polygon_area(points):
+    """Aria unui poligon plan (formula shoelace); se folosesc doar coordonatele X și Y."""
+    pts = np.asarray(points, dtype=float)
+    x, y = pts[:, 0], pts[:, 1]
+    return 0.5 * abs(np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1)))
+
+
+def prism_volume(points, height, holes=()):
+    """
+    Volumul exact al unei extrudări drepte: (aria conturului - aria golurilor) x înălțime.
+
+    Golurile trebuie să fie în interiorul conturului și să nu se suprapună.
+    """
+    area = polygon_area(points) - sum(polygon_area(hole) for hole in holes)
+    return area * abs(height)
+
+
+def box_volume(dx, dy, dz):
+    return abs(dx * dy * dz)
+
+# Semnul offset-ului pe (x, y) pentru colțurile unei camere, în ordinea din create_room_shape
+ROOM_CORNER_SIGNS = np.array([[1, 1], [-1, 1], [-1, -1], [1, -1]], dtype=float)
+
+
+def room_polygons(intersection_matrix, room_table, offsets):
+    """
+    Toate poligoanele decalate ale tuturor camerelor, pentru toate straturile, într-un singur pas.
+
+    Args:
+        intersection_matrix (np.ndarray): Matricea (rânduri, coloane, 2) a intersecțiilor.
+        room_table (np.ndarray): (camere, 4, 2) indicii (i, j) ai colțurilor fiecărei camere.
+        offsets (sequence of float): Decalajul spre interior al fiecărui strat; un decalaj
+            negativ dă un contur spre exterior (ca footprint_rectangle).
+
+    Returns:
+        np.ndarray: (camere, straturi, 4, 2) coordonatele colțurilor.
+    """
+    table = np.asarray(room_table)
+    corners = np.asarray(intersection_matrix, dtype=float)[table[..., 0], table[..., 1]]
+    offsets = np.asarray(offsets, dtype=float)
+    return corners[:, None] + offsets[None, :, None, None] * ROOM_CORNER_SIGNS
+
 
 def create_room_shape(intersection_pts, i1, i2, i3, i4, offset):
     return [
@@ -22,6 +83,7 @@ def create_room_shape(intersection_pts, i1, i2, i3, i4, offset):
         [intersection_pts[i4[0], i4[1], 0] + offset, intersection_pts[i4[0], i4[1], 1] - offset]
     ]
 
+@memoize('create_face')
 def create_face(base_points):
     polygon = BRepBuilderAPI_MakePolygon()
     for point in base_points:
@@ -30,12 +92,14 @@ def create_face(base_points):
     face = BRepBuilderAPI_MakeFace(polygon.Shape())
     return face.Face()
 
-def create_column(insertion_point):
-    x, y = float(insertion_point[0]) - 0.125, float(insertion_point[1]) - 0.125
-    column = BRepPrimAPI_MakeBox(gp_Pnt(x, y, 0), 0.25, 0.25, 2.8).Shape()
-    return column
+def create_column(insertion_point, column_type=None):
+    """Stâlp plasat în punct, ca instanță a prototipului tipului (implicit 0.25 x 0.25 x 2.8)."""
+    from columns import DEFAULT_COLUMN
+    return (column_type or DEFAULT_COLUMN).place(insertion_point)
 
-def create_axis_grid(self, x_interax, y_interax):
+def create_axis_grid(self, x_interax, y_interax, update=True):
+    """Afișează axele grilei și întoarce obiectele AIS create (update=False: fără redesenare)."""
+    axes = []
     axis_color = Quantity_Color(0.0, 1.0, 0.0, Quantity_TOC_RGB)  # Gray color for axes
     
 
@@ -46,7 +110,8 @@ def create_axis_grid(self, x_interax, y_interax):
         edge = BRepBuilderAPI_MakeEdge(start_point, end_point).Edge()
         axis = AIS_Shape(edge)
         axis.SetColor(axis_color)
-        self.canvas._display.Context.Display(axis, True)
+        self.canvas._display.Context.Display(axis, update)
+        axes.append(axis)
 
     # Create Y axes
     for x in x_interax:
@@ -55,7 +120,10 @@ def create_axis_grid(self, x_interax, y_interax):
         edge = BRepBuilderAPI_MakeEdge(start_point, end_point).Edge()
         axis = AIS_Shape(edge)
         axis.SetColor(axis_color)
-        self.canvas._display.Context.Display(axis, True)
+        self.canvas._display.Context.Display(axis, update)
+        axes.append(axis)
+
+    return axes
 
 
 def create_grid(self):
@@ -90,6 +158,7 @@ def create_grid(self):
     
     
 
+@memoize('translate_face')
 def translate_face(face, distance):
     translation = gp_Trsf()
     translation.SetTranslation(gp_Vec(0, 0, distance))
@@ -97,6 +166,18 @@ def translate_face(face, distance):
     return transformed_shape
 
 
+def place_shape(shape, x, y, z=0.0):
+    """
+    Plasează o formă prin locație, fără să îi copieze geometria.
+
+    Toate formele plasate dintr-un prototip au același TShape, deci se
+    triangulează o singură dată și pot fi afișate ca instanțe.
+    """
+    translation = gp_Trsf()
+    translation.SetTranslation(gp_Vec(float(x), float(y), float(z)))
+    return shape.Moved(TopLoc_Location(translation))
+
+
 def toggle_clip_plane(self):
     """
     Activează sau dezactivează planul de tăiere
@@ -127,6 +208,8 @@ def footprint_rectangle(matrix, i1, i2, i3, i4, offset):
 
 
 def showColorDialog(self):
+    from PyQt5.QtWidgets import QColorDialog
+
     color = QColorDialog.getColor()
 
     if color.isValid():
@@ -0,0 +1,214 @@
+import time
+from contextlib import contextmanager
+from OCC.Core.AIS import AIS_Shape, AIS_ConnectedInteractive
+from OCC.Core.TopLoc import TopLoc_Location
+from OCC.Core.Quantity import Quantity_Color, Quantity_TOC_RGB
+
+
+class InstancedDisplay:
+    """
+    Afișează formele plasate (shape.Moved) ca instanțe ale unui prototip comun.
+
+    Pentru fiecare (grup, TShape) se creează un singur AIS_Shape prototip, care
+    nu e afișat; fiecare apariție e un AIS_ConnectedInteractive legat de el și
+    diferă doar prin locație. Prezentarea, triangularea și structurile de
+    selecție ale prototipului sunt partajate de toate instanțele.
+    Formele fără locație sunt afișate normal, ca AIS_Shape. Un prototip e
+    eliberat când ultima instanță legată de el e ștearsă sau mutată pe alt prototip.
+
+    În interiorul lui batch() apelurile display/remove doar pun prezentările în
+    context, iar viewer-ul e redesenat o singură dată la final (sau la fiecare
+    `frame_interval` secunde). `redraws` numără actualizările viewer-ului.
+    """
+
+    def __init__(self, context):
+        self.context = context
+        self.prototypes = {}
+        # Instanța -> cheia (grup, TShape) a prototipului la care e legată
+        self.links = {}
+        # Cheia prototipului -> numărul de instanțe legate de el
+        self.users = {}
+        self.redraws = 0
+        self.pending = 0
+        self.batching = False
+        self.frame_interval = None
+        self.last_redraw = time.perf_counter()
+
+    def prototype(self, group, shape, color=None, transparency=0.0):
+        key = (group, shape)
+        ais = self.prototypes.get(key)
+        if ais is None:
+            ais = styled_ais_shape(shape, color, transparency)
+            self.prototypes[key] = ais
+        return ais
+
+    def _link(self, ais, key, color, transparency, location):
+        ais.Connect(self.prototype(*key, color, transparency), location.Transformation())
+        self.links[ais] = key
+        self.users[key] = self.users.get(key, 0) + 1
+
+    def _unlink(self, ais):
+        key = self.links.pop(ais, None)
+        if key is None:
+            return
+        self.users[key] -= 1
+        if not self.users[key]:
+            del self.users[key]
+            del self.prototypes[key]
+
+    def display(self, group, shape, color=None, transparency=0.0, update=False):
+        """Afișează forma și întoarce obiectul interactiv creat."""
+        location = shape.Location()
+        if location.IsIdentity():
+            ais = styled_ais_shape(shape, color, transparency)
+        else:
+            key = (group, shape.Located(TopLoc_Location()))
+            ais = AIS_ConnectedInteractive()
+            self._link(ais, key, color, transparency, location)
+        self.context.Display(ais, False)
+        self.changed(update)
+        return ais
+
+    def update(self, ais, group, shape, color=None, transparency=0.0, update=False):
+        """
+        Actualizează pe loc un obiect creat de display(), fără o prezentare nouă.
+
+        O instanță al cărei prototip nu s-a schimbat e doar mutată (SetLocation);
+        altfel e legată de noul prototip, iar un AIS_Shape primește noua formă
+        (SetShape). Întoarce False dacă tipul obiectului nu se potrivește cu forma.
+        """
+        location = shape.Location()
+        if location.IsIdentity():
+            if not isinstance(ais, AIS_Shape):
+                return False
+            ais.SetShape(shape)
+            self.context.Redisplay(ais, False)
+        else:
+            if not isinstance(ais, AIS_ConnectedInteractive):
+                return False
+            key = (group, shape.Located(TopLoc_Location()))
+            if self.links.get(ais) == key:
+                self.context.SetLocation(ais, location)
+            else:
+                ais.Disconnect()
+                self._unlink(ais)
+                self._link(ais, key, color, transparency, location)
+                self.context.Redisplay(ais, False)
+        self.changed(update)
+        return True
+
+    def remove(self, ais, update=False):
+        self.context.Remove(ais, False)
+        self._unlink(ais)
+        self.changed(update)
+
+    def changed(self, update=False):
+        """Înregistrează o modificare a contextului și redesenează dacă e cazul."""
+        self.pending += 1
+        if self.batching:
+            if self.frame_interval is not None and time.perf_counter() - self.last_redraw >= self.frame_interval:
+                self.update_viewer()
+        elif update:
+            self.update_viewer()
+
+    def update_viewer(self):
+        self.context.UpdateCurrentViewer()
+        self.redraws += 1
+        self.pending = 0
+        self.last_redraw = time.perf_counter()
+
+    @contextmanager
+    def batch(self, frame_interval=None):
+        """Amână redesenarea până la ieșirea din bloc (sau la cadența dată, în secunde)."""
+        self.batching = True
+        self.frame_interval = frame_interval
+        try:
+            yield self
+        finally:
+            self.batching = False
+            self.frame_interval = None
+            if self.pending:
+                self.update_viewer()
+
+    def clear(self):
+        self.prototypes.clear()
+        self.links.clear()
+        self.users.clear()
+
+    def stats(self):
+        return {'prototypes': len(self.prototypes), 'instances': len(self.links), 'redraws': self.redraws}
+
+
+class ElementRegistry:
+    """
+    Obiectele AIS afișate pentru fiecare element, după ID-ul lui stabil
+    (ex. "column[1,2]", "walls").
+
+    La o regenerare, elementele neschimbate nu sunt atinse; cele schimbate își
+    păstrează obiectele AIS, actualizate prin InstancedDisplay.update, astfel
+    încât prezentările și structurile de selecție nu sunt create din nou.
+    """
+
+    def __init__(self, instanced):
+        self.instanced = instanced
+        self.entries = {}
+        self.created = 0
+        self.updated = 0
+        self.removed = 0
+
+    def update(self, element_id, named_shapes, styles):
+        """
+        Afișează sau actualizează formele (grup, formă) ale unui element.
+
+        Args:
+            styles (dict): grup -> (culoare RGB sau None, transparență).
+
+        Returns:
+            list: Perechile (grup, AIS) create acum (de ex. pentru a le adăuga planul de tăiere).
+        """
+        old = self.entries.get(element_id, [])
+        entries = []
+        created = []
+        for k, (group, shape) in enumerate(named_shapes):
+            color, transparency = styles[group]
+            if k < len(old):
+                old_group, ais = old[k]
+                if old_group == group and self.instanced.update(ais, group, shape, color, transparency):
+                    entries.append((group, ais))
+                    self.updated += 1
+                    continue
+                self.instanced.remove(ais)
+                self.removed += 1
+            ais = self.instanced.display(group, shape, color, transparency)
+            entries.append((group, ais))
+            created.append((group, ais))
+            self.created += 1
+        for _, ais in old[len(named_shapes):]:
+            self.instanced.remove(ais)
+            self.removed += 1
+        self.entries[element_id] = entries
+        return created
+
+    def remove(self, element_id):
+        for _, ais in self.entries.pop(element_id, []):
+            self.instanced.remove(ais)
+            self.removed += 1
+
+    def all_ais(self):
+        return [ais for entries in self.entries.values() for _, ais in entries]
+
+    def clear(self):
+        self.entries.clear()
+
+    def stats(self):
+        return {'elements': len(self.entries), 'created': self.created,
+                'updated': self.updated, 'removed': self.removed}
+
+
+def styled_ais_shape(shape, color=None, transparency=0.0):
+    ais = AIS_Shape(shape)
+    if color:
+        ais.SetColor(Quantity_Color(*color, Quantity_TOC_RGB))
+    if transparency > 0:
+        ais.SetTransparency(transparency)
+    return ais
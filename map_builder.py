@@ -2,22 +2,47 @@
 
 import numpy as np
 
-def column_list(matrix, indices_to_skip):
-    result = []
 
+def skip_mask(shape, indices_to_skip):
+    """
+    Mască booleană (True = sărit) de forma dată, din lista de indici (i, j).
+    Indicii din afara grilei sunt ignorați; o mască deja booleană e întoarsă ca atare.
+    """
+    if isinstance(indices_to_skip, np.ndarray) and indices_to_skip.dtype == bool:
+        if indices_to_skip.shape != tuple(shape):
+            raise ValueError(f"Skip mask shape {indices_to_skip.shape} does not match grid {tuple(shape)}")
+        return indices_to_skip
+    mask = np.zeros(shape, dtype=bool)
+    if indices_to_skip is None:
+        return mask
+    indices = np.asarray(indices_to_skip, dtype=int).reshape(-1, 2)
+    inside = (indices >= 0).all(axis=1) & (indices[:, 0] < shape[0]) & (indices[:, 1] < shape[1])
+    indices = indices[inside]
+    mask[indices[:, 0], indices[:, 1]] = True
+    return mask
 
-    rows, cols, _ = matrix.shape
 
+def column_indices(matrix, indices_to_skip):
+    """Indicii (i, j) ai nodurilor cu stâlp, în ordinea rândurilor: array (n, 2)."""
+    rows, cols = matrix.shape[:2]
+    return np.argwhere(~skip_mask((rows, cols), indices_to_skip))
 
-    for i in range(rows):
-        for j in range(cols):
-            # Verificăm dacă indicele curent trebuie să fie sărit
-            if (i, j) in indices_to_skip:
-                continue
-            result.append(matrix[i, j])
-            
-    return result
 
+def column_list(matrix, indices_to_skip):
+    """
+    Punctele de inserție ale stâlpilor, în ordinea rândurilor.
+
+    Args:
+        matrix (np.ndarray): Matricea de intersecție (rows, cols, 2).
+        indices_to_skip (np.ndarray or list of tuple): Mască booleană (rows, cols)
+            sau lista indicilor de sărit.
+
+    Returns:
+        np.ndarray: Array contiguu (n, 2) de tip float, coordonatele (x, y).
+    """
+    rows, cols = matrix.shape[:2]
+    mask = skip_mask((rows, cols), indices_to_skip)
+    return np.ascontiguousarray(np.asarray(matrix, dtype=float)[~mask])
 
 
 def create_column_points(intersection_matrix, indices_to_skip, offset):
@@ -25,36 +50,22 @@ def create_column_points(intersection_matrix, indices_to_skip, offset):
     Creează puncte de coloană pe baza unei matrice de intersecție, sărind peste indicii specificați.
 
     Args:
-        intersection_matrix (np.ndarray): Matricea de intersecție 3D.
-        indices_to_skip (list of tuple): Lista de tuple care conține indicii pe care dorim să-i sărim.
+        intersection_matrix (np.ndarray): Matricea de intersecție (rows, cols, 2).
+        indices_to_skip (np.ndarray or list of tuple): Mască booleană (rows, cols)
+            sau lista indicilor de sărit.
         offset (float): Offset-ul pentru calculul coordonatelor punctelor coloanelor.
 
     Returns:
-        np.ndarray: O matrice 2D cu punctele coloanelor, excluzând indicii specificați.
+        np.ndarray: (rows, cols, 3, 3, 3); [i, j, a, b] e punctul de pe rândul a
+        (y: -o, 0, +o) și coloana b (x: -o, 0, +o) din jurul nodului (i, j).
+        Nodurile sărite sunt umplute cu NaN.
     """
-    rows, cols, _ = intersection_matrix.shape
-    result = np.empty((rows, cols), dtype=object)
-
-    o1 = offset / 2
-
-    for i in range(rows):
-        for j in range(cols):
-            # Verificăm dacă indicele curent trebuie să fie sărit
-            if (i, j) in indices_to_skip:
-                continue
-
-            p = intersection_matrix[i, j]
-            column_points = np.array([
-                [[p[0] - o1, p[1] - o1, 0],
-                 [p[0], p[1] - o1, 0],
-                 [p[0] + o1, p[1] - o1, 0]],
-                [[p[0] - o1, p[1], 0],
-                 [p[0], p[1], 0],
-                 [p[0] + o1, p[1], 0]],
-                [[p[0] - o1, p[1] + o1, 0],
-                 [p[0], p[1] + o1, 0],
-                 [p[0] + o1, p[1] + o1, 0]]
-            ])
-            result[i, j] = column_points
-
-    return result
\ No newline at end of file
+    points = np.asarray(intersection_matrix, dtype=float)[..., :2]
+    rows, cols, _ = points.shape
+    steps = np.array([-1.0, 0.0, 1.0]) * (offset / 2)
+
+    result = np.zeros((rows, cols, 3, 3, 3))
+    result[..., 0] = points[:, :, None, None, 0] + steps[None, None, None, :]
+    result[..., 1] = points[:, :, None, None, 1] + steps[None, None, :, None]
+    result[skip_mask((rows, cols), indices_to_skip)] = np.nan
+    return result
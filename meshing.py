@@ -0,0 +1,77 @@
+import os
+from OCC.Core.BRepMesh import BRepMesh_IncrementalMesh
+from OCC.Core.BRep import BRep_Builder
+from OCC.Core.TopoDS import TopoDS_Compound
+from OCC.Core.TopLoc import TopLoc_Location
+from OCC.Core.Aspect import Aspect_TOD_ABSOLUTE
+from progress import current_range
+
+# Triangularea formelor înainte de afișare. AIS_Shape triangulează leneș, pe
+# firul UI, la prima afișare; aici toate formele noi sunt triangulate dintr-un
+# singur BRepMesh_IncrementalMesh în mod paralel (fețele sunt împărțite între
+# fire de OCC). Cu aceeași deflecție absolută setată pe context, AIS găsește
+# triangularea existentă și nu o mai recalculează.
+
+DEFAULT_DEFLECTION = 0.01
+DEFAULT_ANGLE = 0.5
+# Deflecția absolută (m) a afișării finale și a formelor scrise în DiskCache
+MESH_DEFLECTION = float(os.environ.get('HOUSEMAKER_MESH_DEFLECTION', DEFAULT_DEFLECTION))
+# Deflecția folosită cât timp utilizatorul editează sau mișcă camera
+COARSE_DEFLECTION = 0.05
+COARSE_ANGLE = 1.0
+
+
+def mesh_shape(shape, deflection=DEFAULT_DEFLECTION, angle=DEFAULT_ANGLE, parallel=True, progress=None):
+    """
+    Triangulează forma pe loc; fețele deja triangulate suficient de fin sunt sărite.
+    Anularea (progress sau intervalul activ pe fir) e verificată înainte și după.
+    """
+    progress = progress or current_range()
+    if progress is not None:
+        progress.check()
+    mesh = BRepMesh_IncrementalMesh(shape, deflection, False, angle, parallel)
+    if progress is not None:
+        progress.done('mesh')
+        progress.check()
+    return mesh.IsDone()
+
+
+def unique_prototypes(shapes):
+    """
+    Formele fără locație, fără duplicate. Triangularea e păstrată pe fețe
+    (TShape), deci instanțele unui prototip (shape.Moved) se triangulează o dată.
+    """
+    unique = {}
+    for shape in shapes:
+        if shape is None or shape.IsNull():
+            continue
+        prototype = shape.Located(TopLoc_Location())
+        unique.setdefault(prototype, prototype)
+    return list(unique)
+
+
+def premesh(shapes, deflection=DEFAULT_DEFLECTION, angle=DEFAULT_ANGLE, parallel=True, progress=None):
+    """
+    Triangulează toate formele într-o singură operație, pe un compus.
+
+    Returns:
+        int: Numărul de prototipuri triangulate.
+    """
+    prototypes = unique_prototypes(shapes)
+    if not prototypes:
+        return 0
+    compound = TopoDS_Compound()
+    builder = BRep_Builder()
+    builder.MakeCompound(compound)
+    for prototype in prototypes:
+        builder.Add(compound, prototype)
+    mesh_shape(compound, deflection, angle, parallel, progress)
+    return len(prototypes)
+
+
+def configure_drawer(context, deflection=DEFAULT_DEFLECTION, angle=DEFAULT_ANGLE):
+    """Setează contextul pe deflecție absolută, ca AIS să refolosească triangularea din premesh."""
+    drawer = context.DefaultDrawer()
+    drawer.SetTypeOfDeflection(Aspect_TOD_ABSOLUTE)
+    drawer.SetMaximalChordialDeviation(deflection)
+    drawer.SetDeviationAngle(angle)
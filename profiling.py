@@ -0,0 +1,74 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Cronometre pe etape pentru regenerarea clădirii. Fiecare etapă devine un
+# eveniment „complet” (ph: X) în formatul Chrome trace-event, care se poate
+# deschide în chrome://tracing sau ui.perfetto.dev; etapele imbricate apar
+# una sub alta pe același fir.
+
+
+class StageTimer:
+    """
+    Înregistrează timpul și numărul de apeluri pentru fiecare etapă.
+
+    Totalurile sunt grupate după categorie (de ex. tipul elementului: "walls",
+    "beam-x") și sunt inclusive: o etapă imbricată e numărată și în părinte.
+    """
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.events = []
+        self.totals = {}
+
+    @contextmanager
+    def stage(self, name, category=None, **args):
+        """
+        Cronometrează blocul `with`. Contextul întoarce dicționarul de argumente
+        al evenimentului; valorile numerice adăugate în el (ex. numărul de
+        operații booleene) se adună în totaluri.
+        """
+        args = dict(args)
+        start = time.perf_counter()
+        try:
+            yield args
+        finally:
+            end = time.perf_counter()
+            self.events.append({
+                'name': name,
+                'cat': category or name,
+                'ph': 'X',
+                'ts': (start - self.origin) * 1e6,
+                'dur': (end - start) * 1e6,
+                'pid': os.getpid(),
+                'tid': threading.get_ident(),
+                'args': args,
+            })
+            total = self.totals.setdefault(category or name, {'count': 0, 'seconds': 0.0})
+            total['count'] += 1
+            total['seconds'] += end - start
+            for key, value in args.items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    total[key] = total.get(key, 0) + value
+
+    def summary(self):
+        """Totalurile pe categorie, de la cea mai lentă la cea mai rapidă."""
+        return dict(sorted(self.totals.items(), key=lambda item: -item[1]['seconds']))
+
+    def status_text(self, top=6):
+        parts = []
+        for category, total in list(self.summary().items())[:top]:
+            text = f"{category} {total['seconds'] * 1000:.0f} ms"
+            if total['count'] > 1:
+                text += f" ({total['count']}x)"
+            parts.append(text)
+        return ', '.join(parts)
+
+    def trace(self):
+        return {'traceEvents': list(self.events), 'displayTimeUnit': 'ms'}
+
+    def write_trace(self, filename):
+        with open(filename, 'w') as f:
+            json.dump(self.trace(), f)
@@ -0,0 +1,90 @@
+import threading
+from contextlib import contextmanager
+
+# Progres și anulare pentru operațiile lungi (booleene, triangulare).
+# Message_ProgressIndicator nu poate fi derivat din Python în pythonocc, deci
+# o operație OCC pornită nu poate fi întreruptă; ProgressRange joacă rolul lui
+# Message_ProgressRange la nivel Python: fiecare operație primește un interval
+# din bară, iar anularea e verificată înainte și imediat după fiecare apel OCC.
+
+
+class OperationCancelled(Exception):
+    """Operația a fost anulată printr-un CancelToken."""
+
+
+class CancelToken:
+    """
+    Cerere de anulare, evaluată la fiecare verificare.
+
+    Args:
+        predicate (callable): Întoarce True când operația trebuie abandonată (de ex. „cererea e învechită”).
+    """
+
+    def __init__(self, predicate):
+        self.predicate = predicate
+
+    def is_cancelled(self):
+        return self.predicate()
+
+
+class ProgressRange:
+    """
+    Intervalul [start, end] al barei de progres (0..1) alocat unei operații.
+
+    Args:
+        callback (callable): callback(valoare, etichetă), apelat la fiecare pas terminat.
+        token (CancelToken): Verificat de check().
+    """
+
+    def __init__(self, start=0.0, end=1.0, callback=None, token=None, label=''):
+        self.start = start
+        self.end = end
+        self.callback = callback
+        self.token = token
+        self.label = label
+
+    def check(self):
+        if self.token is not None and self.token.is_cancelled():
+            raise OperationCancelled(self.label)
+
+    def sub(self, start, end, label=None):
+        """Subintervalul [start, end] (fracțiuni din acest interval)."""
+        span = self.end - self.start
+        return ProgressRange(self.start + span * start, self.start + span * end,
+                             self.callback, self.token, self.label if label is None else label)
+
+    def split(self, count):
+        """`count` subintervale egale, câte unul pentru fiecare pas."""
+        return [self.sub(k / count, (k + 1) / count) for k in range(count)]
+
+    def report(self, fraction, label=None):
+        if self.callback is not None:
+            self.callback(self.start + (self.end - self.start) * fraction, label or self.label)
+
+    def done(self, label=None):
+        self.report(1.0, label)
+
+
+_local = threading.local()
+
+
+def current_range():
+    """Intervalul activ pe firul curent (vezi using), sau None."""
+    stack = getattr(_local, 'stack', None)
+    return stack[-1] if stack else None
+
+
+@contextmanager
+def using(progress):
+    """Face `progress` intervalul implicit al operațiilor pornite în bloc, pe firul curent."""
+    if progress is None:
+        yield None
+        return
+    stack = getattr(_local, 'stack', None)
+    if stack is None:
+        stack = _local.stack = []
+    stack.append(progress)
+    try:
+        yield progress
+    finally:
+        stack.pop()
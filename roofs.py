@@ -6,11 +6,12 @@ from OCC.Core.TopoDS import TopoDS_Compound, TopoDS_Shape
 from OCC.Core.BRep import BRep_Builder
 from OCC.Core.Quantity import Quantity_Color, Quantity_TOC_RGB
 from OCC.Core.AIS import AIS_Shape
-from OCC.Display.SimpleGui import init_display
 from OCC.Core.BRepCheck import BRepCheck_Analyzer
 from OCC.Core.TopExp import TopExp_Explorer
 from OCC.Core.TopAbs import TopAbs_SOLID
+from shape_cache import memoize
 
+@memoize('roof_01')
 def roof_01(point_max, insertion_point, height, roof_height, thickness):
     width = point_max[0]
     depth = point_max[1]
@@ -0,0 +1,137 @@
+import functools
+from collections import OrderedDict
+import numpy as np
+from OCC.Core.gp import gp_Pnt, gp_Vec
+from OCC.Core.TopoDS import TopoDS_Shape
+from OCC.Core.TopExp import TopExp_Explorer
+from OCC.Core.TopAbs import TopAbs_FACE
+
+# Cache în memorie pentru constructorii de forme. Cheia e construită din
+# intrările numerice rotunjite; formele OCC primite ca argument intră în cheie
+# direct (TopoDS_Shape are __hash__/__eq__ pe baza TShape + Location), așa că
+# o tăiere pe forme deja cache-uite devine și ea un hit.
+
+ROUND_DIGITS = 9
+BYTES_PER_FACE = 4096
+
+
+def make_key(value):
+    """Transformă argumentele într-o cheie hashable, cu numerele rotunjite."""
+    if isinstance(value, TopoDS_Shape):
+        return value
+    if isinstance(value, (bool, str, type(None))):
+        return value
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        return round(float(value), ROUND_DIGITS)
+    if isinstance(value, np.ndarray):
+        return ('array', value.shape, tuple(np.round(value.astype(float).ravel(), ROUND_DIGITS)))
+    if isinstance(value, (gp_Pnt, gp_Vec)):
+        return (type(value).__name__,) + tuple(round(c, ROUND_DIGITS) for c in value.Coord())
+    if isinstance(value, (list, tuple)):
+        return tuple(make_key(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, make_key(v)) for k, v in value.items()))
+    if hasattr(value, '__dict__'):
+        return (type(value).__name__, make_key(vars(value)))
+    raise TypeError(f"Cannot build a cache key from {type(value).__name__}")
+
+
+def estimate_bytes(value):
+    """Estimare grosieră a memoriei ocupate de o formă (după numărul de fețe)."""
+    if isinstance(value, TopoDS_Shape):
+        explorer = TopExp_Explorer(value, TopAbs_FACE)
+        faces = 0
+        while explorer.More():
+            faces += 1
+            explorer.Next()
+        return max(faces, 1) * BYTES_PER_FACE
+    if isinstance(value, (list, tuple)):
+        return sum(estimate_bytes(v) for v in value)
+    return 64
+
+
+class ShapeCache:
+    """
+    Cache LRU limitat atât ca număr de intrări, cât și ca memorie estimată.
+
+    Args:
+        max_entries (int): Numărul maxim de rezultate păstrate.
+        max_bytes (int): Memoria estimată maximă (vezi estimate_bytes).
+    """
+
+    def __init__(self, max_entries=4096, max_bytes=256 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+        self.enabled = True
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key, value, size=None):
+        """`size` suprascrie estimarea (de ex. când cheia ține vie o formă mare)."""
+        if size is None:
+            size = estimate_bytes(value)
+        if key in self.entries:
+            self.total_bytes -= self.entries.pop(key)[1]
+        self.entries[key] = (value, size)
+        self.total_bytes += size
+        while self.entries and (len(self.entries) > self.max_entries or self.total_bytes > self.max_bytes):
+            _, (_, evicted_size) = self.entries.popitem(last=False)
+            self.total_bytes -= evicted_size
+            self.evictions += 1
+
+    def clear(self):
+        self.entries.clear()
+        self.total_bytes = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'entries': len(self.entries),
+            'bytes': self.total_bytes,
+        }
+
+
+SHAPE_CACHE = ShapeCache()
+
+
+def memoize(name, cache=None):
+    """Decorator: memorează rezultatul funcției în cache, cheiat după argumente."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            target = cache or SHAPE_CACHE
+            if not target.enabled:
+                return func(*args, **kwargs)
+            try:
+                key = (name, make_key(args), make_key(kwargs))
+            except TypeError:
+                return func(*args, **kwargs)
+            entry = target.get(key)
+            if entry is not None:
+                return entry[0]
+            value = func(*args, **kwargs)
+            target.put(key, value)
+            return value
+        wrapper.uncached = func
+        return wrapper
+    return decorator
+
+
+def cache_stats():
+    return SHAPE_CACHE.stats()
@@ -0,0 +1,139 @@
+import numpy as np
+import pytest
+
+from map_builder import skip_mask, column_indices, column_list, create_column_points
+
+# Testele variantelor NumPy din map_builder, beams și geometry_utils. Ultimele
+# două importă OCC la nivel de modul, deci testele lor sunt sărite fără pythonocc.
+
+# Tabelele clădirii implicite 4 x 4 (building_engine.COLUMN_SKIP, BEAM_SKIP_X, BEAM_SKIP_Y)
+LEGACY_COLUMN_SKIP = [(2, 0), (2, 3)]
+LEGACY_BEAM_SKIP_X = [(2, 0), (2, 2), (1, 1)]
+LEGACY_BEAM_SKIP_Y = [(1, 0), (1, 3)]
+
+
+@pytest.fixture
+def beams():
+    pytest.importorskip('OCC.Core.gp')
+    import beams
+    return beams
+
+
+@pytest.fixture
+def geometry_utils():
+    pytest.importorskip('OCC.Core.gp')
+    import geometry_utils
+    return geometry_utils
+
+
+def grid(rows, cols, span=4.0):
+    X, Y = np.meshgrid(np.arange(cols) * span, np.arange(rows) * span)
+    return np.dstack((X, Y))
+
+
+def node_pairs(pairs, m):
+    """Perechile (nod start, nod sfârșit) ale grinzilor: nodul cel mai apropiat de mijlocul fiecărei fețe."""
+    nodes = np.asarray(m, dtype=float).reshape(-1, 2)
+    cols = m.shape[1]
+
+    def node(face):
+        k = int(np.argmin(np.linalg.norm(nodes - face.mean(axis=0)[:2], axis=1)))
+        return divmod(k, cols)
+    return [(node(start), node(end)) for start, end in pairs]
+
+
+def test_skip_mask_from_indices_ignores_nodes_outside_the_grid():
+    mask = skip_mask((3, 4), [(0, 1), (2, 3), (5, 0), (-1, 2)])
+    assert mask.shape == (3, 4)
+    assert sorted(map(tuple, np.argwhere(mask))) == [(0, 1), (2, 3)]
+
+
+def test_skip_mask_empty_and_boolean_inputs():
+    assert not skip_mask((3, 3), None).any()
+    assert not skip_mask((3, 3), []).any()
+    mask = np.zeros((3, 3), dtype=bool)
+    assert skip_mask((3, 3), mask) is mask
+    with pytest.raises(ValueError):
+        skip_mask((2, 3), mask)
+
+
+def test_column_list_skips_nodes_in_row_order():
+    m = grid(4, 4)
+    points = column_list(m, LEGACY_COLUMN_SKIP)
+    assert points.shape == (14, 2)
+    assert points.flags['C_CONTIGUOUS']
+    assert [tuple(p) for p in points[:4]] == [(0, 0), (4, 0), (8, 0), (12, 0)]
+    assert (0, 8) not in {tuple(p) for p in points}
+    assert column_indices(m, LEGACY_COLUMN_SKIP).tolist() == [
+        [i, j] for i in range(4) for j in range(4) if (i, j) not in LEGACY_COLUMN_SKIP]
+
+
+def test_create_column_points_marks_skipped_nodes_with_nan():
+    points = create_column_points(grid(3, 3), [(1, 1)], 0.25)
+    assert points.shape == (3, 3, 3, 3, 3)
+    assert np.isnan(points[1, 1]).all()
+    assert not np.isnan(np.delete(points.reshape(9, -1), 4, axis=0)).any()
+    # [a, b]: rândul a merge pe y, coloana b pe x, în jurul nodului
+    assert points[0, 2, 0, 0].tolist() == [8 - 0.125, -0.125, 0.0]
+    assert points[0, 2, 2, 2].tolist() == [8 + 0.125, 0.125, 0.0]
+
+
+def test_legacy_grid_beams(beams):
+    m = grid(4, 4)
+    points = beams.beam_points(m, 0.25)
+    column_skip = skip_mask((4, 4), LEGACY_COLUMN_SKIP)
+    x_beams, y_beams = beams.create_beam_pairs(points, LEGACY_BEAM_SKIP_X, LEGACY_BEAM_SKIP_Y, column_skip)
+
+    assert x_beams.shape == (9, 2, 3, 3)
+    x_nodes = node_pairs(x_beams, m)
+    assert len(set(x_nodes)) == 9
+    assert ((2, 0), (2, 1)) not in x_nodes and ((1, 1), (1, 2)) not in x_nodes
+    # Pe Y, grinzile coloanelor 0 și 3 trec peste nodul lipsă de pe rândul 2
+    y_nodes = node_pairs(y_beams, m)
+    assert len(y_nodes) == 10
+    assert ((1, 0), (3, 0)) in y_nodes and ((1, 3), (3, 3)) in y_nodes
+    assert not np.isnan(np.concatenate([x_beams, y_beams])).any()
+
+
+def test_y_beams_bridge_consecutive_missing_nodes(beams):
+    m = grid(5, 3)
+    points = beams.beam_points(m, 0.25)
+    # (2, 0) lipsește doar prin skipy (forma tabelelor vechi: (i, j) marchează nodul (i+1, j))
+    column_skip = skip_mask((5, 3), [(1, 0), (4, 2)])
+    _, y_beams = beams.create_beam_pairs(points, beams.beam_skips(column_skip), [(1, 0)], column_skip)
+    y_nodes = node_pairs(y_beams, m)
+    assert [pair for pair in y_nodes if pair[0][1] == 0] == [((0, 0), (3, 0)), ((3, 0), (4, 0))]
+    # Nodul lipsă de la capătul coloanei 2 nu primește grindă
+    assert [pair for pair in y_nodes if pair[0][1] == 2] == [((0, 2), (1, 2)), ((1, 2), (2, 2)), ((2, 2), (3, 2))]
+    assert column_skip.sum() == 2, "create_beam_pairs must not modify the caller's mask"
+
+
+def test_beam_skips(beams):
+    column_skip = skip_mask((4, 4), LEGACY_COLUMN_SKIP)
+    assert beams.beam_skips(column_skip).tolist() == [[2, 0], [2, 2]]
+
+    empty = np.zeros((3, 4), dtype=bool)
+    assert beams.beam_skips(empty).shape == (0, 2)
+    points = beams.beam_points(grid(3, 4), 0.25)
+    x_beams, y_beams = beams.create_beam_pairs(points, beams.beam_skips(empty), column_skip=empty)
+    assert len(x_beams) == 3 * 3 and len(y_beams) == 4 * 2
+
+
+def test_room_polygons_offsets_every_layer(geometry_utils):
+    m = grid(3, 3)
+    table = np.array([[[0, 0], [0, 1], [1, 1], [1, 0]], [[1, 1], [1, 2], [2, 2], [2, 1]]])
+    polygons = geometry_utils.room_polygons(m, table, [0.125, -0.5])
+    assert polygons.shape == (2, 2, 4, 2)
+    for r, corners in enumerate(table):
+        for k, offset in enumerate([0.125, -0.5]):
+            expected = geometry_utils.create_room_shape(m, *corners, offset)
+            assert np.allclose(polygons[r, k], expected)
+    assert geometry_utils.polygon_area(polygons[0, 0]) == pytest.approx((4 - 0.25) ** 2)
+    assert geometry_utils.polygon_area(polygons[1, 1]) == pytest.approx((4 + 1.0) ** 2)
+
+
+def test_polygon_area_ignores_orientation_and_z(geometry_utils):
+    square = [[0, 0, 5], [2, 0, 5], [2, 3, 5], [0, 3, 5]]
+    assert geometry_utils.polygon_area(square) == pytest.approx(6.0)
+    assert geometry_utils.polygon_area(square[::-1]) == pytest.approx(6.0)
+    assert geometry_utils.prism_volume(square, -2.0, [[[0.5, 0.5], [1, 0.5], [1, 1], [0.5, 1]]]) == pytest.approx(11.5)